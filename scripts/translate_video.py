@@ -4,8 +4,7 @@ from pathlib import Path
 
 from dotenv import load_dotenv
 
-from translate_agent import PipelineConfig, VideoTranslationAgent
-from translate_agent.config import TTSConfig, TranscriptionConfig, TranslationConfig
+from translate_agent.config import PipelineConfig, TTSConfig, TranscriptionConfig, TranslationConfig
 
 
 def parse_args() -> argparse.Namespace:
@@ -14,21 +13,61 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--run-name", type=str, help="Optional name for this translation run.")
     parser.add_argument("--output-dir", type=Path, default=Path("artifacts"), help="Directory to store generated artifacts.")
     parser.add_argument("--overwrite", action="store_true", help="Overwrite previous runs with the same name.")
+    parser.add_argument(
+        "--whisper-backend",
+        type=str,
+        choices=["faster_whisper", "whispercpp", "nemo_parakeet"],
+        default="faster_whisper",
+        help="Transcription backend (whispercpp runs quantized ggml models on CPU; nemo_parakeet is a fast English-only GPU model).",
+    )
     parser.add_argument("--whisper-model", type=str, default="base", help="Whisper model size (tiny/base/small/medium/large).")
+    parser.add_argument(
+        "--whisper-compute-type",
+        type=str,
+        help="CTranslate2 compute type for Whisper (e.g., int8, float16). Defaults to int8 on CPU and float16 on GPU.",
+    )
+    parser.add_argument("--whisper-batch-size", type=int, default=16, help="Number of VAD chunks decoded per Whisper batch (1 disables batching).")
+    parser.add_argument("--no-vad", action="store_true", help="Disable voice activity detection before transcription.")
+    parser.add_argument("--no-multi-gpu", action="store_true", help="Use a single GPU even when several are available.")
+    parser.add_argument("--no-flash-attention", action="store_true", help="Disable FlashAttention for Whisper on Ampere+ GPUs.")
+    parser.add_argument("--whisper-prompt", type=str, help="Initial prompt for Whisper (e.g., course topic and proper nouns).")
     parser.add_argument("--translation-provider", type=str, choices=["openai", "deepseek"], default="openai", help="Translation backend to use.")
     parser.add_argument("--translation-model", type=str, default="gpt-4o-mini", help="Model name for translation provider.")
     parser.add_argument("--translation-api-base", type=str, help="Custom base URL for translation API (optional).")
     parser.add_argument("--translation-api-key-env", type=str, help="Environment variable containing translation API key.")
+    parser.add_argument("--translation-concurrency", type=int, default=8, help="Maximum number of concurrent translation requests.")
+    parser.add_argument("--translation-batch-size", type=int, default=20, help="Number of segments translated per request (1 translates one by one).")
+    parser.add_argument(
+        "--translation-cache",
+        type=Path,
+        help="SQLite file caching finished translations (default: <output-dir>/cache/translations.sqlite3).",
+    )
+    parser.add_argument("--no-translation-cache", action="store_true", help="Always call the translation API, ignoring cached results.")
     parser.add_argument("--tts-provider", type=str, choices=["openai", "edge"], default="openai", help="TTS backend to use.")
     parser.add_argument("--tts-model", type=str, default="gpt-4o-mini-tts", help="Model name for OpenAI TTS provider.")
     parser.add_argument("--tts-voice", type=str, default="alloy", help="Voice name for the TTS model.")
     parser.add_argument("--tts-format", type=str, default="wav", help="Audio format for synthesized speech (wav/mp3).")
     parser.add_argument("--speaking-rate", type=float, default=1.0, help="Relative speaking rate for the TTS voice.")
+    parser.add_argument("--tts-concurrency", type=int, default=4, help="Maximum number of concurrent TTS requests.")
+    parser.add_argument(
+        "--tts-batch-size",
+        type=int,
+        default=1,
+        help="Short segments synthesized per OpenAI TTS request, split back at pauses (1 disables batching).",
+    )
+    parser.add_argument(
+        "--discard-tts-segments",
+        action="store_true",
+        help="Keep synthesized speech in memory only instead of writing tts_segments/ files.",
+    )
+    parser.add_argument("--tts-cache", type=Path, help="Directory caching synthesized speech (default: <output-dir>/cache/tts).")
+    parser.add_argument("--no-tts-cache", action="store_true", help="Always call the TTS API, ignoring cached audio.")
     parser.add_argument("--tts-api-base", type=str, help="Custom base URL for TTS API (optional).")
     parser.add_argument("--tts-api-key-env", type=str, help="Environment variable containing TTS API key.")
     parser.add_argument("--edge-voice", type=str, default="zh-CN-XiaoxiaoNeural", help="Voice ID for Edge TTS provider.")
-    parser.add_argument("--edge-rate", type=str, default="+0%", help="Speech rate adjustment for Edge TTS (e.g., +10%).")
-    parser.add_argument("--edge-volume", type=str, default="+0%", help="Volume adjustment for Edge TTS (e.g., +0%).")
+    parser.add_argument("--edge-rate", type=str, default="+0%", help="Speech rate adjustment for Edge TTS (e.g., +10%%).")
+    parser.add_argument("--edge-concurrency", type=int, help="Maximum number of concurrent Edge TTS requests (default: --tts-concurrency).")
+    parser.add_argument("--edge-volume", type=str, default="+0%", help="Volume adjustment for Edge TTS (e.g., +0%%).")
     parser.add_argument(
         "--edge-output-format",
         type=str,
@@ -37,6 +76,13 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument("--temperature", type=float, default=0.3, help="Temperature for the translation model.")
     parser.add_argument("--no-mix", action="store_true", help="Do not keep the original English audio underneath the dub.")
+    parser.add_argument(
+        "--mix-mode",
+        type=str,
+        choices=["mix", "duck"],
+        default="mix",
+        help="Keep the original audio at a constant level (mix) or duck it under the dub (duck).",
+    )
     parser.add_argument("--mix-level", type=float, default=0.25, help="Volume multiplier for the original English audio.")
     parser.add_argument("--sample-rate", type=int, help="Optional sample rate hint for the dubbed audio track.")
     parser.add_argument("--log-level", type=str, default="INFO", help="Logging level (DEBUG, INFO, WARNING, ERROR).")
@@ -44,7 +90,16 @@ def parse_args() -> argparse.Namespace:
 
 
 def build_config(args: argparse.Namespace) -> PipelineConfig:
-    transcription = TranscriptionConfig(model_size=args.whisper_model)
+    transcription = TranscriptionConfig(
+        backend=args.whisper_backend,
+        model_size=args.whisper_model,
+        compute_type=args.whisper_compute_type,
+        batch_size=args.whisper_batch_size,
+        vad_filter=not args.no_vad,
+        multi_gpu=not args.no_multi_gpu,
+        flash_attention=not args.no_flash_attention,
+        initial_prompt=args.whisper_prompt,
+    )
 
     translation_model = args.translation_model
     if args.translation_provider == "deepseek" and translation_model == "gpt-4o-mini":
@@ -53,17 +108,27 @@ def build_config(args: argparse.Namespace) -> PipelineConfig:
     if not translation_api_key_env:
         translation_api_key_env = "OPENAI_API_KEY" if args.translation_provider == "openai" else "DEEPSEEK_API_KEY"
 
+    translation_cache = None
+    if not args.no_translation_cache:
+        translation_cache = args.translation_cache or args.output_dir / "cache" / "translations.sqlite3"
+
     translation = TranslationConfig(
         provider=args.translation_provider,
         model=translation_model,
         temperature=args.temperature,
         api_base=args.translation_api_base,
         api_key_env=translation_api_key_env,
+        max_concurrency=args.translation_concurrency,
+        batch_size=args.translation_batch_size,
+        cache_path=translation_cache,
     )
 
     tts_format = args.tts_format
     if args.tts_provider == "edge" and tts_format.lower() == "wav":
         tts_format = "mp3"
+    tts_cache = None
+    if not args.no_tts_cache:
+        tts_cache = args.tts_cache or args.output_dir / "cache" / "tts"
     tts_api_key_env = args.tts_api_key_env or ("OPENAI_API_KEY" if args.tts_provider == "openai" else None)
 
     tts = TTSConfig(
@@ -72,12 +137,17 @@ def build_config(args: argparse.Namespace) -> PipelineConfig:
         voice=args.tts_voice,
         format=tts_format,
         speaking_rate=args.speaking_rate,
+        tts_concurrency=args.tts_concurrency,
+        batch_size=args.tts_batch_size,
+        keep_segment_files=not args.discard_tts_segments,
+        cache_dir=tts_cache,
         api_base=args.tts_api_base,
         api_key_env=tts_api_key_env,
         edge_voice=args.edge_voice,
         edge_rate=args.edge_rate,
         edge_volume=args.edge_volume,
         edge_output_format=args.edge_output_format,
+        edge_concurrency=args.edge_concurrency,
     )
 
     return PipelineConfig(
@@ -88,6 +158,7 @@ def build_config(args: argparse.Namespace) -> PipelineConfig:
         overwrite=args.overwrite,
         mix_original_audio=not args.no_mix,
         original_audio_mix_level=args.mix_level,
+        mix_mode=args.mix_mode,
         sample_rate_hint=args.sample_rate,
     )
 
@@ -97,6 +168,9 @@ def main() -> None:
     load_dotenv()
     logging.basicConfig(level=getattr(logging, args.log_level.upper(), logging.INFO))
 
+    # 解析完参数后再加载流水线，--help 与参数错误可以立即返回
+    from translate_agent import VideoTranslationAgent
+
     config = build_config(args)
     agent = VideoTranslationAgent(config=config)
 
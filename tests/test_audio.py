@@ -0,0 +1,50 @@
+import subprocess
+
+import numpy as np
+import soundfile as sf
+
+from translate_agent.audio import build_dub_track, split_at_silences
+from translate_agent.types import TranscriptSegment
+from translate_agent.utils import ffmpeg_executable
+
+
+def test_build_dub_track_decodes_aac_clip(tmp_path):
+    clip = tmp_path / "0001.aac"
+    subprocess.run(
+        [ffmpeg_executable(), "-y", "-loglevel", "error", "-f", "lavfi", "-i", "sine=frequency=440:duration=0.5:sample_rate=24000", str(clip)],
+        check=True,
+    )
+    segment = TranscriptSegment(start=0.25, end=0.75, text="hello", translation="你好", tts_path=clip)
+
+    output = build_dub_track([segment], duration_seconds=1.0, output_path=tmp_path / "dub.wav")
+
+    data, sample_rate = sf.read(str(output), dtype="int16")
+    assert sample_rate == 24000
+    assert len(data) == 24000
+    assert not data[: sample_rate // 4].any()
+    assert np.abs(data[sample_rate // 4 + 2400 :]).max() > 1000
+
+
+def _tone(seconds, sample_rate=24000):
+    return (np.sin(np.arange(int(seconds * sample_rate)) * 0.1) * 10000).astype(np.int16)
+
+
+def _silence(seconds, sample_rate=24000):
+    return np.zeros(int(seconds * sample_rate), dtype=np.int16)
+
+
+def test_split_at_silences_follows_text_lengths():
+    pcm = np.concatenate([_tone(1.0), _silence(0.5), _tone(2.0)])
+
+    pieces = split_at_silences(pcm, 24000, 2, weights=[10, 20])
+
+    assert pieces is not None
+    assert [round(len(piece) / 24000, 1) for piece in pieces] == [1.2, 2.3]
+
+
+def test_split_at_silences_rejects_cut_inside_a_sentence():
+    # 第二句内部的长停顿比两句之间的间隔更长，按时长切分会把第二句的前半段分给第一句
+    pcm = np.concatenate([_tone(0.5), _silence(0.3), _tone(1.0), _silence(0.8), _tone(1.0)])
+
+    assert split_at_silences(pcm, 24000, 2) is not None
+    assert split_at_silences(pcm, 24000, 2, weights=[5, 20]) is None
@@ -0,0 +1,29 @@
+import pytest
+
+from translate_agent import transcription
+from translate_agent.config import TranscriptionConfig
+from translate_agent.transcription import WhisperTranscriber
+
+
+@pytest.mark.parametrize("compute_type", ["int8", "int8_float16", "int8_bfloat16", "float32"])
+def test_flash_attention_disabled_for_non_half_compute_types(compute_type):
+    assert not WhisperTranscriber._supports_flash_attention("cuda", compute_type)
+
+
+def test_model_reloads_without_flash_attention_when_rejected(monkeypatch):
+    calls = []
+
+    class FakeWhisperModel:
+        def __init__(self, model_size, **kwargs):
+            calls.append(kwargs)
+            if kwargs.get("flash_attention"):
+                raise ValueError("Flash attention 2 is not supported")
+
+    monkeypatch.setattr(transcription, "WhisperModel", FakeWhisperModel)
+    monkeypatch.setattr(WhisperTranscriber, "_supports_flash_attention", classmethod(lambda cls, device, compute_type: True))
+    config = TranscriptionConfig(device="cuda", compute_type="float16", batch_size=1, gpu_features=False, multi_gpu=False)
+
+    model = WhisperTranscriber(config)._load_model()
+
+    assert isinstance(model, FakeWhisperModel)
+    assert [call.get("flash_attention") for call in calls] == [True, None]
@@ -0,0 +1,57 @@
+import asyncio
+import inspect
+from types import SimpleNamespace
+
+import pytest
+from openai.resources.audio.speech import AsyncSpeech
+
+from translate_agent.config import TTSConfig
+from translate_agent.tts import OpenAITTS
+
+
+@pytest.fixture
+def tts(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    return OpenAITTS(TTSConfig(provider="openai", format="mp3"))
+
+
+@pytest.mark.parametrize("response_format", [None, "wav"])
+def test_speech_params_match_sdk_signature(tts, response_format):
+    params = tts._speech_params("你好", response_format=response_format)
+
+    inspect.signature(AsyncSpeech.create).bind(None, **params)
+    assert params["response_format"] == (response_format or "mp3")
+
+
+class _FakeStreamingResponse:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def iter_bytes(self, chunk_size):
+        yield b"ab"
+        yield b"cd"
+
+
+class _FakeStreamingSpeech:
+    def __init__(self):
+        self.calls = []
+
+    def create(self, **kwargs):
+        inspect.signature(AsyncSpeech.create).bind(None, **kwargs)
+        self.calls.append(kwargs)
+        return _FakeStreamingResponse()
+
+
+async def _collect(stream):
+    return b"".join([chunk async for chunk in stream])
+
+
+def test_synthesize_to_stream_uses_sdk_kwargs(tts):
+    speech = _FakeStreamingSpeech()
+    tts.aclient = SimpleNamespace(audio=SimpleNamespace(speech=SimpleNamespace(with_streaming_response=speech)))
+
+    assert asyncio.run(_collect(tts.synthesize_to_stream("你好"))) == b"abcd"
+    assert speech.calls[0]["response_format"] == "mp3"
@@ -1,5 +1,15 @@
 """High-level pipeline to translate English videos into Chinese-dubbed videos."""
 
-from .pipeline import VideoTranslationAgent, PipelineConfig
+from .config import PipelineConfig
 
 __all__ = ["VideoTranslationAgent", "PipelineConfig"]
+
+
+def __getattr__(name: str):
+    # 延迟导入流水线（openai、faster-whisper、moviepy 等较重的依赖），
+    # 只读取配置或查看 CLI 帮助时无需加载
+    if name == "VideoTranslationAgent":
+        from .pipeline import VideoTranslationAgent
+
+        return VideoTranslationAgent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,16 +1,24 @@
 from __future__ import annotations
 
+import io
 import logging
 import math
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Iterable, List, Optional, Sequence, Tuple
 
-from pydub import AudioSegment
+import numpy as np
+import soundfile as sf
 
 from .types import TranscriptSegment
+from .utils import ffmpeg_executable
 
 logger = logging.getLogger(__name__)
 
+SNDFILE_FORMATS = {"wav", "flac"}
+
 
 def build_dub_track(
     segments: Iterable[TranscriptSegment],
@@ -27,32 +35,176 @@ def build_dub_track(
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     sample_rate = sample_rate_hint
-    primer_audio: Optional[AudioSegment] = None
-    for segment in segments:
-        if segment.tts_path and segment.tts_path.exists():
-            primer_audio = AudioSegment.from_file(segment.tts_path)
-            sample_rate = sample_rate or primer_audio.frame_rate
-            break
-
+    if sample_rate is None:
+        for segment in segments:
+            if segment.tts_audio is not None:
+                sample_rate = segment.tts_sample_rate
+                break
+            if segment.tts_path and segment.tts_path.exists():
+                sample_rate = _clip_sample_rate(segment.tts_path)
+                break
     if sample_rate is None:
         sample_rate = 24000
-        primer_audio = AudioSegment.silent(duration=500, frame_rate=sample_rate)
 
-    total_duration_ms = int(math.ceil(duration_seconds * 1000.0)) + 500
-    base_track = AudioSegment.silent(duration=total_duration_ms, frame_rate=sample_rate)
+    # 预分配整条音轨，每个片段只做一次原地累加，避免反复重建整条音轨；
+    # 片段以 int16 保存、在 int32 中累加，重叠片段不会溢出，内存带宽只有 float32 的一半
+    total_samples = int(duration_seconds * sample_rate)
+    mix = np.zeros(total_samples, dtype=np.int32)
 
+    placed = []
     for segment in segments:
-        if not segment.tts_path or not segment.tts_path.exists():
+        if segment.tts_audio is None and (not segment.tts_path or not segment.tts_path.exists()):
             logger.warning("Skipping segment without TTS audio: %s", segment)
             continue
-        clip = AudioSegment.from_file(segment.tts_path)
-        if clip.frame_rate != sample_rate:
-            clip = clip.set_frame_rate(sample_rate)
-        position_ms = max(0, int(segment.start * 1000))
-        base_track = base_track.overlay(clip, position=position_ms)
-
-    finalized = base_track[: int(duration_seconds * 1000)]
-    audio_format = output_path.suffix.lstrip(".") or "wav"
-    finalized.export(output_path, format=audio_format)
+        placed.append(segment)
+
+    # libsndfile 解码与重采样期间会释放 GIL，多线程并行解码各个片段；
+    # 按路径去重，同一个文件只解码、重采样一次，函数结束后随 futures 一起释放。
+    # 已在内存中解码的配音直接使用，只在采样率不同时重采样
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        clips = {}
+        for segment in placed:
+            key = _clip_key(segment)
+            if key in clips:
+                continue
+            if segment.tts_audio is not None:
+                clips[key] = executor.submit(_conform_clip, segment.tts_audio, segment.tts_sample_rate, sample_rate)
+            else:
+                clips[key] = executor.submit(_load_clip, segment.tts_path, sample_rate)
+        for segment in placed:
+            clip = clips[_clip_key(segment)].result()
+            start = max(0, int(segment.start * sample_rate))
+            end = min(total_samples, start + len(clip))
+            if end > start:
+                mix[start:end] += clip[: end - start]
+
+    np.clip(mix, -32768, 32767, out=mix)
+    write_audio(mix.astype(np.int16), sample_rate, output_path)
     logger.info("Created dubbed audio track at %s", output_path)
     return output_path
+
+
+def write_audio(pcm: np.ndarray, sample_rate: int, output_path: Path) -> None:
+    """Write mono int16 PCM; wav/flac are written in-process, other formats are encoded by ffmpeg."""
+    audio_format = output_path.suffix.lstrip(".").lower()
+    if audio_format in SNDFILE_FORMATS:
+        sf.write(str(output_path), pcm, sample_rate, subtype="PCM_16")
+        return
+    # mp3 / aac / opus 等有损格式 libsndfile 不一定支持，通过管道把 PCM 交给 ffmpeg 编码
+    command = [
+        ffmpeg_executable(), "-y", "-loglevel", "error",
+        "-f", "s16le", "-ar", str(sample_rate), "-ac", "1", "-i", "pipe:0",
+        str(output_path),
+    ]
+    result = subprocess.run(command, input=pcm.tobytes(), capture_output=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed to encode {output_path}: {result.stderr.decode(errors='replace').strip()}")
+
+
+def split_at_silences(
+    pcm: np.ndarray,
+    sample_rate: int,
+    parts: int,
+    min_silence_s: float = 0.25,
+    threshold_db: float = -40.0,
+    weights: Optional[Sequence[float]] = None,
+    max_ratio: float = 2.0,
+) -> Optional[List[np.ndarray]]:
+    """Cut int16 PCM into ``parts`` pieces at its ``parts - 1`` longest inner silences.
+
+    With ``weights`` (e.g. the text length of each piece), every piece's share of the total
+    duration must be within ``max_ratio`` of its share of the weights. Returns None when the
+    audio does not contain enough silences to split on or the pieces fail that check.
+    """
+    frame = max(1, int(sample_rate * 0.02))
+    count = len(pcm) // frame
+    if parts < 2 or count == 0:
+        return [pcm] if parts == 1 else None
+    frames = pcm[: count * frame].astype(np.float32).reshape(count, frame) / 32768.0
+    silent = np.sqrt(np.mean(frames**2, axis=1)) < 10 ** (threshold_db / 20)
+    # 以 20 ms 为一帧找出连续静音段，首尾的静音不作为切分点
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], silent.astype(np.int8), [0]))))
+    runs = [(start, end) for start, end in zip(edges[::2], edges[1::2]) if start > 0 and end < count]
+    runs = [run for run in runs if (run[1] - run[0]) * frame >= min_silence_s * sample_rate]
+    if len(runs) < parts - 1:
+        return None
+    longest = sorted(sorted(runs, key=lambda run: run[1] - run[0], reverse=True)[: parts - 1])
+    cuts = [(start + end) // 2 * frame for start, end in longest]
+    pieces = np.split(pcm, cuts)
+    if weights is not None and not _proportional(pieces, weights, max_ratio):
+        return None
+    return pieces
+
+
+def _proportional(pieces: List[np.ndarray], weights: Sequence[float], max_ratio: float) -> bool:
+    total_samples = sum(len(piece) for piece in pieces)
+    total_weight = sum(max(1.0, float(weight)) for weight in weights)
+    for piece, weight in zip(pieces, weights):
+        ratio = (len(piece) / total_samples) / (max(1.0, float(weight)) / total_weight)
+        if not 1 / max_ratio <= ratio <= max_ratio:
+            return False
+    return True
+
+
+def decode_audio_bytes(data: bytes) -> Tuple[np.ndarray, int]:
+    """Decode an encoded clip (mp3, wav, ...) held in memory to mono int16 PCM."""
+    return _decode_with_av(io.BytesIO(data))
+
+
+def _decode_with_av(source) -> Tuple[np.ndarray, int]:
+    import av
+
+    with av.open(source) as container:
+        stream = container.streams.audio[0]
+        # 统一转换为单声道 int16，解码后直接用于混音
+        resampler = av.AudioResampler(format="s16", layout="mono", rate=stream.rate)
+        frames = []
+        for frame in container.decode(stream):
+            frames.extend(out.to_ndarray().reshape(-1) for out in resampler.resample(frame))
+        frames.extend(out.to_ndarray().reshape(-1) for out in resampler.resample(None))
+        sample_rate = stream.rate
+    audio = np.concatenate(frames) if frames else np.zeros(0, dtype=np.int16)
+    return audio.astype(np.int16, copy=False), sample_rate
+
+
+def _clip_key(segment: TranscriptSegment) -> str:
+    if segment.tts_audio is not None:
+        return f"mem:{id(segment.tts_audio)}"
+    return str(segment.tts_path)
+
+
+def _clip_sample_rate(path: Path) -> int:
+    try:
+        return sf.info(str(path)).samplerate
+    except RuntimeError:
+        import av
+
+        with av.open(str(path)) as container:
+            return container.streams.audio[0].rate
+
+
+def _load_clip(path: Path, sample_rate: int) -> np.ndarray:
+    """Decode a clip to mono int16 PCM at ``sample_rate``."""
+    try:
+        data, source_rate = sf.read(str(path), dtype="int16")
+    except RuntimeError:
+        # libsndfile 不支持 aac，opus 取决于编译选项，这些格式交给 PyAV 解码
+        data, source_rate = _decode_with_av(str(path))
+    if data.ndim > 1:
+        data = data.mean(axis=1).astype(np.int16)
+    return _conform_clip(data, source_rate, sample_rate)
+
+
+def _conform_clip(data: np.ndarray, source_rate: int, sample_rate: int) -> np.ndarray:
+    """Return int16 PCM at ``sample_rate``, resampling in float32 only when the rates differ."""
+    if source_rate != sample_rate:
+        resampled = _resample(data.astype(np.float32), source_rate, sample_rate)
+        data = np.clip(resampled, -32768, 32767).astype(np.int16)
+    return data
+
+
+def _resample(data: np.ndarray, source_rate: int, target_rate: int) -> np.ndarray:
+    from scipy.signal import resample_poly
+
+    divisor = math.gcd(source_rate, target_rate)
+    return resample_poly(data, target_rate // divisor, source_rate // divisor).astype(np.float32)
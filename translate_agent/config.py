@@ -7,9 +7,23 @@ from typing import Optional
 class TranscriptionConfig:
     """Configuration for Whisper transcription."""
 
+    backend: str = "faster_whisper"  # faster_whisper、whispercpp（纯 CPU 环境）或 nemo_parakeet（英文长音频）
     model_size: str = "tiny"  # 更改默认模型为 tiny，提高CPU上的运行速度
     language: str = "en"
     device: Optional[str] = None  # 默认不指定设备，让系统自动选择
+    compute_type: Optional[str] = None  # 默认 CPU 使用 int8，GPU 使用 float16
+    batch_size: int = 16  # 批量解码的 VAD 片段数，设为 1 时使用顺序解码
+    vad_filter: bool = True
+    vad_min_silence_ms: int = 1000  # 静音超过该时长即切分，静音段不再送入解码
+    vad_speech_pad_ms: int = 400  # 每个语音片段两侧保留的上下文
+    no_speech_threshold: float = 0.6
+    initial_prompt: Optional[str] = None  # 专有名词、课程主题等提示词
+    repetition_limit: int = 3  # 同一短语连续重复超过该次数时折叠，0 表示不过滤
+    gpu_features: bool = True  # GPU 上用 torch 计算 log-mel 特征（需安装 CUDA 版 torch）
+    multi_gpu: bool = True  # 多张 GPU 时按 VAD 静音切分音频并行识别
+    flash_attention: bool = True  # Ampere 及以上 GPU 的自注意力使用 FlashAttention
+    whispercpp_model: Optional[str] = None  # whisper.cpp 模型名或 ggml 文件路径，默认 <model_size>-q8_0
+    nemo_model: str = "nvidia/parakeet-tdt-1.1b"
 
 
 @dataclass
@@ -21,8 +35,11 @@ class TranslationConfig:
     temperature: float = 0.3
     max_retries: int = 3
     retry_delay: float = 3.0
+    max_concurrency: int = 8  # 同时进行的翻译请求数
+    batch_size: int = 20  # 每个请求合并翻译的片段数，设为 1 时逐段翻译
     api_base: Optional[str] = None
     api_key_env: Optional[str] = "OPENAI_API_KEY"
+    cache_path: Optional[Path] = None  # SQLite 翻译缓存文件，None 表示不缓存
 
 
 @dataclass
@@ -34,12 +51,19 @@ class TTSConfig:
     voice: str = "alloy"
     format: str = "wav"
     speaking_rate: float = 1.0
+    tts_concurrency: int = 4  # 同时进行的配音请求数
+    batch_size: int = 1  # OpenAI TTS 每个请求合并的短句数，按停顿切回各片段；1 表示逐段请求
+    batch_max_chars: int = 80  # 超过该长度的句子不参与合并
+    keep_segment_files: bool = True  # 是否在 tts_segments/ 下保留每段配音；关闭时音频只在内存中解码混音
+    cache_dir: Optional[Path] = None  # 跨运行共享的配音缓存目录，None 表示不缓存
+    cache_max_bytes: int = 2 * 1024**3  # 缓存超过该大小时按最近使用时间淘汰
     api_base: Optional[str] = None
     api_key_env: Optional[str] = "OPENAI_API_KEY"
     edge_voice: str = "zh-CN-XiaoxiaoNeural"
     edge_rate: str = "+0%"
     edge_volume: str = "+0%"
     edge_output_format: str = "audio-24khz-48kbitrate-mono-mp3"
+    edge_concurrency: Optional[int] = None  # Edge TTS 同时进行的请求数，None 时使用 tts_concurrency
 
 
 @dataclass
@@ -53,4 +77,5 @@ class PipelineConfig:
     overwrite: bool = True
     mix_original_audio: bool = True
     original_audio_mix_level: float = 0.25
+    mix_mode: str = "mix"  # mix：原声固定音量；duck：配音出现时自动压低原声
     sample_rate_hint: Optional[int] = None
\ No newline at end of file
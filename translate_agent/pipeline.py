@@ -1,20 +1,22 @@
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Optional
 
+import orjson
 from openai import OpenAI
 
 from .audio import build_dub_track
 from .config import PipelineConfig
 from .subtitles import write_bilingual_srt
-from .transcription import WhisperTranscriber
+from .transcription import build_transcriber
 from .translation import build_translator
 from .tts import build_tts
 from .types import PipelineArtifacts, TranscriptSegment
+from .utils import run_async
 from .video import get_video_duration, mux_video_with_audio
 
 logger = logging.getLogger(__name__)
@@ -27,7 +29,7 @@ class VideoTranslationAgent:
         self.config = config or PipelineConfig()
         self.client = client or (OpenAI() if self._requires_openai_client() else None)
         logger.info("Initializing Whisper transcriber...")
-        self.transcriber = WhisperTranscriber(self.config.transcription)
+        self.transcriber = build_transcriber(self.config.transcription)
         logger.info("Initializing translator...")
         self.translator = build_translator(self.config.translation, client=self.client)
         logger.info("Initializing TTS...")
@@ -49,21 +51,13 @@ class VideoTranslationAgent:
         logger.info("Starting translation run '%s' for %s", run_name, video_path)
         run_dir.mkdir(parents=True, exist_ok=True)
 
-        logger.info("Step 1/4: Transcribing source audio...")
+        logger.info("Steps 1-3/4: Transcribing, translating and synthesizing segments as overlapping stages...")
         logger.info("Note: Transcription with Whisper can take several minutes to hours for long videos")
-        logger.info("Progress will be displayed during processing")
-        segments = self._create_transcript(video_path)
-        logger.info("Step 1/4 complete: %d segments transcribed", len(segments))
-
-        logger.info("Step 2/4: Translating transcript segments...")
-        self._translate_segments(segments)
-        logger.info("Step 2/4 complete")
-
-        logger.info("Step 3/4: Generating TTS audio segments...")
-        self._synthesize_audio(segments, run_dir / "tts_segments")
-        logger.info("Step 3/4 complete")
-
+        logger.info("Translation and TTS start as soon as the first segments are transcribed")
         duration = get_video_duration(video_path)
+        segments = run_async(self._run_stages(video_path, run_dir / "tts_segments", duration))
+        logger.info("Steps 1-3/4 complete: %d segments transcribed, translated and synthesized", len(segments))
+
         logger.info("Step 4/4: Building dubbed track and muxing final video...")
         dubbed_audio_path = build_dub_track(
             segments=segments,
@@ -77,6 +71,7 @@ class VideoTranslationAgent:
             output_path=run_dir / "video" / f"{run_name}_zh.mp4",
             mix_original_audio=self.config.mix_original_audio,
             original_volume=self.config.original_audio_mix_level,
+            mix_mode=self.config.mix_mode,
         )
         subtitles_path = write_bilingual_srt(
             segments=segments,
@@ -94,25 +89,79 @@ class VideoTranslationAgent:
         logger.info("Translation run completed. Artifacts: %s", artifacts)
         return artifacts
 
-    def _create_transcript(self, video_path: Path) -> list[TranscriptSegment]:
-        logger.debug("Creating transcript for %s", video_path)
-        result = self.transcriber.transcribe(video_path)
-        logger.debug("Transcript creation returned %d segments", len(result))
-        return result
-
-    def _translate_segments(self, segments: list[TranscriptSegment]) -> None:
-        logger.info("Translating %s transcript segments...", len(segments))
-        total_segments = len(segments)
-        logger.info("Translation will process %d segments. This may take a while.", total_segments)
-        self.translator.translate_segments(segments)
-        logger.info("Translation completed for all %d segments", total_segments)
-
-    def _synthesize_audio(self, segments: list[TranscriptSegment], output_dir: Path) -> None:
-        logger.info("Generating Chinese TTS audio for %s segments...", len(segments))
-        total_segments = len(segments)
-        logger.info("TTS will generate %d audio segments. This may take a while.", total_segments)
-        self.tts.synthesize_segments(segments, output_dir=output_dir)
-        logger.info("TTS completed for all %d segments", total_segments)
+    async def _run_stages(self, video_path: Path, tts_dir: Path, duration: float) -> list[TranscriptSegment]:
+        """Run transcription, translation and TTS as a producer/consumer chain.
+
+        Each stage forwards segments through an ``asyncio.Queue`` as soon as they are
+        ready, so translation starts with the first transcribed batch and TTS starts
+        with the first translated one. ``None`` marks the end of a queue.
+        """
+        segments: list[TranscriptSegment] = []
+        q_trans: asyncio.Queue = asyncio.Queue()
+        q_tts: asyncio.Queue = asyncio.Queue()
+        batch_size = max(1, self.config.translation.batch_size)
+
+        async def transcribe_stage() -> None:
+            async for segment in self.transcriber.stream_transcribe(video_path, duration=duration):
+                segments.append(segment)
+                await q_trans.put((len(segments), segment))
+            logger.info("Transcription stage finished: %d segments", len(segments))
+            await q_trans.put(None)
+
+        async def translate_batch(batch: list[tuple[int, TranscriptSegment]]) -> None:
+            await self.translator.atranslate([segment for _, segment in batch])
+            await q_tts.put(batch)
+
+        async def translate_stage() -> None:
+            tasks = []
+            finished = False
+            try:
+                while not finished:
+                    # 凑满一批再提交，保持批量翻译的请求数优势
+                    batch = []
+                    while len(batch) < batch_size:
+                        item = await q_trans.get()
+                        if item is None:
+                            finished = True
+                            break
+                        batch.append(item)
+                    if batch:
+                        tasks.append(asyncio.ensure_future(translate_batch(batch)))
+                await asyncio.gather(*tasks)
+            except BaseException:
+                # 本阶段被取消或某一批失败时，已提交的批次一并取消并等待其退出
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+            logger.info("Translation stage finished")
+            await q_tts.put(None)
+
+        async def translated() -> AsyncIterator[tuple[int, TranscriptSegment]]:
+            while True:
+                batch = await q_tts.get()
+                if batch is None:
+                    return
+                for item in batch:
+                    yield item
+
+        async def tts_stage() -> None:
+            count = 0
+            async for _ in self.tts.synthesize_stream(translated(), tts_dir):
+                count += 1
+            logger.info("TTS stage finished: %d segments", count)
+
+        async with self.translator.session(), self.tts.session():
+            stages = [asyncio.ensure_future(stage()) for stage in (transcribe_stage, translate_stage, tts_stage)]
+            try:
+                await asyncio.gather(*stages)
+            except BaseException:
+                for stage in stages:
+                    stage.cancel()
+                # 等各阶段真正退出后再关闭客户端，避免取消中的请求落在已关闭的会话上
+                await asyncio.gather(*stages, return_exceptions=True)
+                raise
+        return segments
 
     def _write_transcript_json(self, segments: list[TranscriptSegment], output_path: Path) -> Path:
         output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -126,7 +175,8 @@ class VideoTranslationAgent:
             }
             for segment in segments
         ]
-        output_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        # orjson 直接输出 UTF-8 字节，中文不转义
+        output_path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
         return output_path
 
     def _default_run_name(self, video_path: Path) -> str:
@@ -1,78 +1,502 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import os
+import queue
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Iterable, List
+from typing import AsyncIterator, Iterator, List, Optional, Tuple, Union
 
-import whisper
+import numpy as np
+from faster_whisper import BatchedInferencePipeline, WhisperModel, decode_audio
+from faster_whisper.feature_extractor import FeatureExtractor
+from faster_whisper.vad import VadOptions, get_speech_timestamps
 
 from .config import TranscriptionConfig
 from .types import TranscriptSegment
 
 logger = logging.getLogger(__name__)
 
+# Whisper 单个解码窗口为 30 秒，VAD 切出的语音片段不超过该长度
+MAX_SPEECH_CHUNK_S = 30
+SAMPLING_RATE = 16000
+FLASH_ATTENTION_COMPUTE_TYPES = {"float16", "bfloat16"}
 
-class WhisperTranscriber:
-    """Wrapper around OpenAI Whisper for generating timestamped transcripts."""
+
+def collapse_repetitions(text: str, limit: int = 3, max_ngram: int = 4) -> str:
+    """Collapse runs of an n-gram repeated more than ``limit`` times in a row.
+
+    Whisper occasionally loops on a phrase ("thank you. thank you. ...") over music or
+    noise; the run is kept up to ``limit`` occurrences.
+    """
+    words = text.split()
+    for n in range(1, max_ngram + 1):
+        keys = [word.lower().strip(".,!?;:") for word in words]
+        collapsed = []
+        idx = 0
+        while idx < len(words):
+            gram = keys[idx : idx + n]
+            repeats = 1
+            while len(gram) == n and keys[idx + repeats * n : idx + (repeats + 1) * n] == gram:
+                repeats += 1
+            if repeats > limit:
+                collapsed.extend(words[idx : idx + limit * n])
+                idx += repeats * n
+            else:
+                collapsed.append(words[idx])
+                idx += 1
+        words = collapsed
+    return " ".join(words)
+
+
+class TorchFeatureExtractor(FeatureExtractor):
+    """Log-mel feature extractor that runs the STFT and mel projection with torch on the GPU.
+
+    Drop-in replacement for faster-whisper's NumPy extractor, which computes the whole
+    spectrogram on the CPU before every decode.
+    """
+
+    def __init__(self, device: str = "cuda", **kwargs):
+        import torch
+
+        super().__init__(**kwargs)
+        self._torch = torch
+        self._device = device
+        # np.hanning(n + 1)[:-1] 与 torch 的周期 Hann 窗一致
+        self._window = torch.hann_window(self.n_fft, device=device)
+        self._mel_filters = torch.from_numpy(self.mel_filters).to(device)
+
+    def __call__(self, waveform: np.ndarray, padding: int = 160, chunk_length: Optional[int] = None) -> np.ndarray:
+        torch = self._torch
+        if chunk_length is not None:
+            self.n_samples = chunk_length * self.sampling_rate
+            self.nb_max_frames = self.n_samples // self.hop_length
+        with torch.inference_mode():
+            audio = torch.from_numpy(np.ascontiguousarray(waveform, dtype=np.float32)).to(self._device)
+            if padding:
+                audio = torch.nn.functional.pad(audio, (0, padding))
+            stft = torch.stft(audio, self.n_fft, self.hop_length, window=self._window, return_complex=True)
+            magnitudes = stft[..., :-1].abs() ** 2
+            log_spec = torch.clamp(self._mel_filters @ magnitudes, min=1e-10).log10()
+            log_spec = torch.maximum(log_spec, log_spec.max() - 8.0)
+            log_spec = (log_spec + 4.0) / 4.0
+            return log_spec.cpu().numpy()
+
+
+class BaseTranscriber:
+    config: TranscriptionConfig
+
+    def transcribe(self, media_path: Path, duration: Optional[float] = None) -> List[TranscriptSegment]:
+        return list(self.iter_segments(media_path, duration=duration))
+
+    async def stream_transcribe(
+        self, media_path: Path, duration: Optional[float] = None
+    ) -> AsyncIterator[TranscriptSegment]:
+        """Yield segments as the decoder produces them, without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        iterator = self.iter_segments(media_path, duration=duration)
+        finished = object()
+        while True:
+            segment = await loop.run_in_executor(None, next, iterator, finished)
+            if segment is finished:
+                return
+            yield segment
+
+    def iter_segments(self, media_path: Path, duration: Optional[float] = None) -> Iterator[TranscriptSegment]:
+        raise NotImplementedError
+
+    def _vad_options(self) -> VadOptions:
+        return VadOptions(
+            min_silence_duration_ms=self.config.vad_min_silence_ms,
+            speech_pad_ms=self.config.vad_speech_pad_ms,
+            max_speech_duration_s=MAX_SPEECH_CHUNK_S,
+        )
+
+    def _make_segment(self, start: float, end: float, text: str) -> Optional[TranscriptSegment]:
+        """Build a segment from decoder output, dropping it if nothing is left after filtering."""
+        text = text.strip()
+        if self.config.repetition_limit > 0:
+            text = collapse_repetitions(text, limit=self.config.repetition_limit)
+        if not text:
+            return None
+        return TranscriptSegment(start=float(start), end=float(end), text=text)
+
+
+class WhisperTranscriber(BaseTranscriber):
+    """Wrapper around faster-whisper (CTranslate2) for generating timestamped transcripts."""
 
     def __init__(self, config: TranscriptionConfig):
         self.config = config
         self._model = None
+        self._pipeline = None
 
     def _load_model(self):
         if self._model is not None:
             return self._model
-        logger.info("Loading Whisper model '%s' on device '%s'...", self.config.model_size, self.config.device or "default")
+        device = self.config.device or "auto"
+        compute_type = self.config.compute_type or ("int8" if self._resolve_device(device) == "cpu" else "float16")
+        logger.info(
+            "Loading Whisper model '%s' on device '%s' (compute type: %s)...",
+            self.config.model_size,
+            device,
+            compute_type,
+        )
+        model_kwargs = {}
+        if self.config.flash_attention and self._supports_flash_attention(device, compute_type):
+            model_kwargs["flash_attention"] = True
+            logger.info("Using FlashAttention for Whisper self-attention")
+        device_indices = self._device_indices()
+        if len(device_indices) > 1:
+            # device_index 中的每张 GPU 各加载一份模型副本，并发调用时由 CTranslate2 分派到空闲的卡上
+            logger.info("Loading Whisper on %s GPUs", len(device_indices))
         try:
-            self._model = whisper.load_model(self.config.model_size, device=self.config.device)
+            try:
+                self._model = self._create_model(device, device_indices, compute_type, model_kwargs)
+            except (RuntimeError, ValueError) as exc:
+                if not model_kwargs.pop("flash_attention", False):
+                    raise
+                # 部分 CTranslate2 构建不含 FlashAttention，或当前模型不支持，退回普通注意力
+                logger.warning("FlashAttention unavailable (%s); loading Whisper without it", exc)
+                self._model = self._create_model(device, device_indices, compute_type, model_kwargs)
+            if self.config.gpu_features and self._resolve_device(device) == "cuda":
+                self._enable_gpu_features(self._model)
+            if self._use_batched_pipeline():
+                self._pipeline = BatchedInferencePipeline(model=self._model)
             logger.info("Whisper model loaded successfully")
         except Exception as e:
             logger.error("Failed to load Whisper model: %s", e)
             raise
         return self._model
 
-    def transcribe(self, media_path: Path) -> List[TranscriptSegment]:
-        model = self._load_model()
-        logger.info("Transcribing audio from %s", media_path)
-        
-        # 获取音频时长以估算处理时间
-        import subprocess
-        import json
+    def _create_model(self, device: str, device_indices: List[int], compute_type: str, model_kwargs: dict) -> WhisperModel:
+        return WhisperModel(
+            self.config.model_size,
+            device=device,
+            device_index=device_indices,
+            compute_type=compute_type,
+            # num_workers 是每张卡上的副本数，设为 1 即总共 len(device_indices) 份
+            num_workers=1,
+            **model_kwargs,
+        )
+
+    @staticmethod
+    def _enable_gpu_features(model: WhisperModel) -> None:
         try:
-            cmd = ["ffprobe", "-v", "quiet", "-print_format", "json", "-show_format", "-show_streams", str(media_path)]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            probe_data = json.loads(result.stdout)
-            duration = float(probe_data["format"]["duration"])
-            logger.info("Audio duration: %.1f minutes. Estimated processing time: %.1f-%.1f minutes (depending on model and hardware)", 
-                       duration/60, duration/60/10, duration/60/3)
-        except Exception as e:
-            logger.debug("Could not determine audio duration: %s", e)
-            
-        logger.info("This may take a while depending on the audio length and model size...")
-        logger.info("For a 1-hour audio:")
-        logger.info("  Tiny model:  ~10-20 minutes")
-        logger.info("  Base model:  ~30-60 minutes") 
-        logger.info("  Small model: ~60-120 minutes")
+            import torch
+        except ImportError:
+            logger.debug("torch is not installed; computing Whisper features on the CPU")
+            return
+        if not torch.cuda.is_available():
+            logger.debug("torch has no CUDA support; computing Whisper features on the CPU")
+            return
+        # 批量管线与顺序解码都通过 model.feature_extractor 计算特征，替换后两种路径都会走 GPU
+        model.feature_extractor = TorchFeatureExtractor(device="cuda", **model.feat_kwargs)
+        logger.info("Computing Whisper log-mel features on the GPU")
+
+    @classmethod
+    def _supports_flash_attention(cls, device: str, compute_type: str) -> bool:
+        # CTranslate2 只在 float16 / bfloat16 计算下支持 FlashAttention，int8 等量化类型会在加载时报错
+        if compute_type not in FLASH_ATTENTION_COMPUTE_TYPES or cls._resolve_device(device) != "cuda":
+            return False
+        import ctranslate2
+
+        # CTranslate2 的 FlashAttention 需要 Ampere（SM 8.0）及以上显卡，这类显卡同时支持 bfloat16
+        return "bfloat16" in ctranslate2.get_supported_compute_types("cuda")
+
+    def _use_batched_pipeline(self) -> bool:
+        # 批量推理依赖 VAD 切分出的语音片段，关闭 VAD 时退回逐窗口顺序解码
+        return self.config.vad_filter and self.config.batch_size > 1
+
+    @staticmethod
+    def _resolve_device(device: str) -> str:
+        if device != "auto":
+            return device
+        import ctranslate2
+
+        return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+
+    def _device_indices(self) -> List[int]:
+        device = self.config.device or "auto"
+        if not self.config.multi_gpu or self._resolve_device(device) != "cuda":
+            return [0]
+        import ctranslate2
+
+        return list(range(max(1, ctranslate2.get_cuda_device_count())))
+
+    def iter_segments(self, media_path: Path, duration: Optional[float] = None) -> Iterator[TranscriptSegment]:
+        """Yield transcript segments; ``duration`` (seconds) is only used for the ETA hint."""
+        self._load_model()
+        logger.info("Transcribing audio from %s", media_path)
+        if duration is not None and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Audio duration: %.1f minutes. Estimated processing time: %.1f-%.1f minutes (depending on model and hardware)",
+                duration / 60,
+                duration / 60 / 10,
+                duration / 60 / 3,
+            )
+            logger.debug("For a 1-hour audio:")
+            logger.debug("  Tiny model:  ~10-20 minutes")
+            logger.debug("  Base model:  ~30-60 minutes")
+            logger.debug("  Small model: ~60-120 minutes")
         logger.info("Processing... Please be patient.")
         try:
-            result = model.transcribe(
-                str(media_path),
+            if len(self._device_indices()) > 1 and self.config.vad_filter:
+                raw_segments = self._decode_multi_gpu(media_path)
+            else:
+                raw_segments, info = self._decode(str(media_path))
+                logger.debug("Detected language '%s' (duration %.1fs)", info.language, info.duration)
+            # faster-whisper 返回惰性生成器，遍历时才真正解码，片段可以边识别边交给下游
+            count = 0
+            for start, end, text in raw_segments:
+                segment = self._make_segment(start, end, text)
+                if segment is None:
+                    continue
+                count += 1
+                logger.debug("Segment %03d: %.2f-%.2f %s", count, segment.start, segment.end, segment.text)
+                yield segment
+            logger.info("Transcription complete: %s segments", count)
+        except Exception as e:
+            logger.error("Error during transcription: %s", e)
+            raise
+
+    def _decode(self, audio: Union[str, np.ndarray], offset: float = 0.0) -> Tuple[Iterator[Tuple[float, float, str]], object]:
+        """Start decoding ``audio``; returns a lazy iterator of (start, end, text) and the info object."""
+        if self._pipeline is not None:
+            # VAD 片段会被合并为不超过 30 秒、时长相近的块，再按 batch_size 并行解码
+            segments, info = self._pipeline.transcribe(
+                audio,
+                language=self.config.language,
+                task="transcribe",
+                batch_size=self.config.batch_size,
+                word_timestamps=False,
+                no_speech_threshold=self.config.no_speech_threshold,
+                initial_prompt=self.config.initial_prompt,
+                vad_filter=True,
+                vad_parameters=self._vad_options(),
+            )
+        else:
+            segments, info = self._model.transcribe(
+                audio,
                 language=self.config.language,
                 task="transcribe",
                 condition_on_previous_text=False,
                 word_timestamps=False,
+                no_speech_threshold=self.config.no_speech_threshold,
+                initial_prompt=self.config.initial_prompt,
+                vad_filter=self.config.vad_filter,
+                vad_parameters=self._vad_options(),
             )
-            logger.info("Transcription completed, processing segments")
-            segments: Iterable[dict] = result.get("segments", [])
-            collected = [
-                TranscriptSegment(start=float(seg["start"]), end=float(seg["end"]), text=seg["text"].strip())
-                for seg in segments
-            ]
-            logger.info("Transcription complete: %s segments", len(collected))
-            if logger.isEnabledFor(logging.DEBUG):
-                for idx, seg in enumerate(collected, start=1):
-                    logger.debug("Segment %03d: %.2f-%.2f %s", idx, seg.start, seg.end, seg.text)
-            return collected
-        except Exception as e:
-            logger.error("Error during transcription: %s", e)
-            raise
\ No newline at end of file
+        return ((seg.start + offset, seg.end + offset, seg.text) for seg in segments), info
+
+    def _decode_multi_gpu(self, media_path: Path) -> Iterator[Tuple[float, float, str]]:
+        """Split the audio at VAD silences into one contiguous span per GPU and decode them concurrently."""
+        audio = decode_audio(str(media_path), sampling_rate=SAMPLING_RATE)
+        spans = self._split_at_silences(audio, len(self._device_indices()))
+        logger.info("Transcribing %s spans concurrently on %s GPUs", len(spans), len(self._device_indices()))
+
+        finished = object()
+        outputs: List[queue.Queue] = [queue.Queue() for _ in spans]
+
+        def decode_span(span: Tuple[int, int], output: queue.Queue) -> None:
+            try:
+                segments, _ = self._decode(audio[span[0] : span[1]], offset=span[0] / SAMPLING_RATE)
+                for segment in segments:
+                    output.put(segment)
+            except BaseException as exc:
+                output.put(exc)
+                raise
+            finally:
+                output.put(finished)
+
+        # CTranslate2 把并发的 transcribe 调用分派到各张卡各自的模型副本上；
+        # 各段在时间上连续且互不重叠，按段的顺序输出即是按 start 排序。
+        # 第一段边解码边输出，后面各段解码出的片段先在各自队列中排队
+        with ThreadPoolExecutor(max_workers=len(spans)) as executor:
+            futures = [executor.submit(decode_span, span, output) for span, output in zip(spans, outputs)]
+            for output in outputs:
+                while True:
+                    item = output.get()
+                    if item is finished:
+                        break
+                    if isinstance(item, BaseException):
+                        raise item
+                    yield item
+            for future in futures:
+                future.result()
+
+    def _split_at_silences(self, audio: np.ndarray, parts: int) -> List[Tuple[int, int]]:
+        """Return up to ``parts`` sample ranges holding similar amounts of speech, cut between VAD chunks."""
+        chunks = get_speech_timestamps(audio, self._vad_options())
+        if len(chunks) < 2 or parts < 2:
+            return [(0, len(audio))]
+        speech = np.cumsum([chunk["end"] - chunk["start"] for chunk in chunks])
+        spans = []
+        span_start = 0
+        for part in range(1, parts):
+            # 在累计语音时长达到 part/parts 的位置之后、下一个语音块开始之前的静音中点切分
+            idx = int(np.searchsorted(speech, speech[-1] * part / parts))
+            if idx >= len(chunks) - 1:
+                break
+            cut = (chunks[idx]["end"] + chunks[idx + 1]["start"]) // 2
+            if cut > span_start:
+                spans.append((span_start, cut))
+                span_start = cut
+        spans.append((span_start, len(audio)))
+        return spans
+
+
+class WhisperCppTranscriber(BaseTranscriber):
+    """CPU transcription with whisper.cpp (ggml) through pywhispercpp."""
+
+    def __init__(self, config: TranscriptionConfig):
+        self.config = config
+        self._model = None
+
+    def _load_model(self):
+        if self._model is not None:
+            return self._model
+        try:
+            from pywhispercpp.model import Model
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise RuntimeError(
+                "pywhispercpp is not installed. Install with `pip install \".[whispercpp]\"`."
+            ) from exc
+        # 默认使用 8 bit 量化的 ggml 模型，CPU 上内存占用和速度都优于 float 权重
+        model_name = self.config.whispercpp_model or f"{self.config.model_size}-q8_0"
+        logger.info("Loading whisper.cpp model '%s'...", model_name)
+        self._model = Model(model_name, n_threads=os.cpu_count() or 4, print_progress=False, print_realtime=False)
+        logger.info("whisper.cpp model loaded successfully")
+        return self._model
+
+    def iter_segments(self, media_path: Path, duration: Optional[float] = None) -> Iterator[TranscriptSegment]:
+        model = self._load_model()
+        logger.info("Transcribing audio from %s with whisper.cpp", media_path)
+        audio = decode_audio(str(media_path), sampling_rate=SAMPLING_RATE)
+        produced: "queue.Queue" = queue.Queue()
+        finished = object()
+        errors: List[BaseException] = []
+
+        def worker() -> None:
+            try:
+                # whisper.cpp 每解出一个片段就回调一次，片段可以边识别边交给下游
+                model.transcribe(
+                    audio,
+                    new_segment_callback=produced.put,
+                    language=self.config.language,
+                    initial_prompt=self.config.initial_prompt or "",
+                    no_speech_thold=self.config.no_speech_threshold,
+                )
+            except BaseException as exc:  # noqa: BLE001 - re-raised in the consumer thread
+                errors.append(exc)
+            finally:
+                produced.put(finished)
+
+        threading.Thread(target=worker, name="whispercpp", daemon=True).start()
+        count = 0
+        while True:
+            seg = produced.get()
+            if seg is finished:
+                break
+            # t0 / t1 的单位为 10 毫秒
+            segment = self._make_segment(seg.t0 / 100, seg.t1 / 100, seg.text)
+            if segment is None:
+                continue
+            count += 1
+            logger.debug("Segment %03d: %.2f-%.2f %s", count, segment.start, segment.end, segment.text)
+            yield segment
+        if errors:
+            logger.error("Error during transcription: %s", errors[0])
+            raise errors[0]
+        logger.info("Transcription complete: %s segments", count)
+
+
+class NemoTranscriber(BaseTranscriber):
+    """English transcription with an NVIDIA NeMo Parakeet (FastConformer-TDT) model."""
+
+    def __init__(self, config: TranscriptionConfig):
+        self.config = config
+        self._model = None
+
+    def _load_model(self):
+        if self._model is not None:
+            return self._model
+        try:
+            from nemo.collections.asr.models import ASRModel
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise RuntimeError("nemo_toolkit is not installed. Install with `pip install \".[nemo]\"`.") from exc
+        language = (self.config.language or "en").lower()
+        if not language.startswith("en") and _is_english_only_nemo_model(self.config.nemo_model):
+            logger.warning(
+                "NeMo model '%s' only transcribes English; language '%s' will be ignored",
+                self.config.nemo_model,
+                self.config.language,
+            )
+        logger.info("Loading NeMo model '%s'...", self.config.nemo_model)
+        self._model = ASRModel.from_pretrained(self.config.nemo_model)
+        self._model.eval()
+        logger.info("NeMo model loaded successfully")
+        return self._model
+
+    def iter_segments(self, media_path: Path, duration: Optional[float] = None) -> Iterator[TranscriptSegment]:
+        import soundfile as sf
+
+        model = self._load_model()
+        logger.info("Transcribing audio from %s with NeMo", media_path)
+        audio = decode_audio(str(media_path), sampling_rate=SAMPLING_RATE)
+        # 先用 VAD 切出不超过 30 秒的语音块，静音不送入模型，长音频也不会一次占满显存
+        chunks = get_speech_timestamps(audio, self._vad_options())
+        batch_size = max(1, self.config.batch_size)
+        count = 0
+        with tempfile.TemporaryDirectory(prefix="nemo_") as tmp_dir:
+            for batch_start in range(0, len(chunks), batch_size):
+                batch = chunks[batch_start : batch_start + batch_size]
+                paths = []
+                for idx, chunk in enumerate(batch):
+                    path = Path(tmp_dir) / f"chunk_{batch_start + idx:05d}.wav"
+                    sf.write(str(path), audio[chunk["start"] : chunk["end"]], SAMPLING_RATE, subtype="PCM_16")
+                    paths.append(str(path))
+                hypotheses = model.transcribe(paths, batch_size=batch_size, timestamps=True, verbose=False)
+                if isinstance(hypotheses, tuple):
+                    # RNNT / TDT 模型返回 (最佳假设, 全部假设)，只取最佳假设
+                    hypotheses = hypotheses[0]
+                for chunk, hyp in zip(batch, hypotheses):
+                    offset = chunk["start"] / SAMPLING_RATE
+                    for start, end, text in self._hypothesis_segments(hyp, (chunk["end"] - chunk["start"]) / SAMPLING_RATE):
+                        segment = self._make_segment(offset + start, offset + end, text)
+                        if segment is None:
+                            continue
+                        count += 1
+                        logger.debug("Segment %03d: %.2f-%.2f %s", count, segment.start, segment.end, segment.text)
+                        yield segment
+        logger.info("Transcription complete: %s segments", count)
+
+    @staticmethod
+    def _hypothesis_segments(hyp, chunk_duration: float) -> List[Tuple[float, float, str]]:
+        """Sentence-level (start, end, text) from a hypothesis, relative to its chunk."""
+        timestamps = getattr(hyp, "timestamp", None) or {}
+        segments = timestamps.get("segment") if isinstance(timestamps, dict) else None
+        if segments:
+            return [(float(item["start"]), float(item["end"]), item["segment"]) for item in segments]
+        # 没有分句时间戳时，整个语音块作为一个片段
+        text = hyp.text if hasattr(hyp, "text") else str(hyp)
+        return [(0.0, chunk_duration, text)]
+
+
+def _is_english_only_nemo_model(name: str) -> bool:
+    # Parakeet v1/v2 只支持英语，v3 起为多语言模型
+    name = name.lower()
+    return "parakeet" in name and "-v3" not in name and "multilingual" not in name
+
+
+def build_transcriber(config: TranscriptionConfig) -> BaseTranscriber:
+    backend = (config.backend or "faster_whisper").lower()
+    if backend == "faster_whisper":
+        return WhisperTranscriber(config)
+    if backend == "whispercpp":
+        return WhisperCppTranscriber(config)
+    if backend == "nemo_parakeet":
+        return NemoTranscriber(config)
+    raise ValueError(f"Unsupported transcription backend: {config.backend}")
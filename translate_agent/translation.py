@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import logging
 import os
-import time
-from typing import Iterable, List, Optional
+import sqlite3
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterable, List, Optional
 
-import requests
-from openai import OpenAI
+import aiohttp
+from openai import AsyncOpenAI, OpenAI
 
 try:
     from openai import APIError  # type: ignore
@@ -16,6 +21,7 @@ except ImportError:  # Backwards compat for older SDKs
 
 from .config import TranslationConfig
 from .types import TranscriptSegment
+from .utils import openai_http_client, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -24,9 +30,137 @@ DEFAULT_PROMPT_PREFIX = (
     "保持原意和语气，不要添加额外说明或数字编号。\n\n"
 )
 
+BATCH_PROMPT_PREFIX = (
+    "将下面 JSON 数组中每一条英文口语内容分别翻译成符合中文口语习惯的表达，用于视频配音。"
+    "保持原意和语气，不要添加额外说明，不要合并或拆分条目。"
+    '请以 JSON 对象返回结果，格式为 {"translations": [{"id": 0, "zh": "..."}, ...]}，id 与输入一一对应。\n\n'
+)
+
+
+class TranslationCache:
+    """SQLite-backed store of finished translations, shared across runs."""
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path))
+        self._conn.execute("CREATE TABLE IF NOT EXISTS t(k TEXT PRIMARY KEY, v TEXT)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT v FROM t WHERE k = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def put_many(self, items: Dict[str, str]) -> None:
+        self._conn.executemany("INSERT OR REPLACE INTO t(k, v) VALUES (?, ?)", items.items())
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
 
 class BaseTranslator:
+    config: TranslationConfig
+    progress_label = "Translation progress"
+
     def translate_segments(self, segments: Iterable[TranscriptSegment]) -> List[TranscriptSegment]:
+        translated = list(segments)
+        run_async(self._atranslate_segments(translated))
+        return translated
+
+    async def _atranslate_segments(self, segments: List[TranscriptSegment]) -> None:
+        async with self.session():
+            await self.atranslate(segments)
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[None]:
+        """Open the HTTP client, cache and concurrency limit shared by `atranslate` calls."""
+        # sqlite 连接不能跨线程使用，因此在事件循环所在线程中打开
+        self._cache = TranslationCache(self.config.cache_path) if self.config.cache_path else None
+        self._semaphore = asyncio.Semaphore(max(1, self.config.max_concurrency))
+        self._completed = 0
+        self._cache_hits = 0
+        try:
+            async with self._open_client():
+                yield
+        finally:
+            if self._cache_hits:
+                logger.info("%s: %s segments served from translation cache", self.progress_label, self._cache_hits)
+            if self._cache is not None:
+                self._cache.close()
+            self._cache = None
+
+    async def atranslate(self, segments: List[TranscriptSegment]) -> None:
+        """Translate a group of segments in place; must run inside `session()`."""
+        pending = self._resolve_cached(segments)
+        batch_size = max(1, self.config.batch_size)
+        texts = list(pending)
+        batches = [texts[start : start + batch_size] for start in range(0, len(texts), batch_size)]
+        await asyncio.gather(*(self._translate_pending(batch, pending) for batch in batches))
+
+    def _resolve_cached(self, segments: List[TranscriptSegment]) -> Dict[str, List[TranscriptSegment]]:
+        """Fill translations already in the cache; group the rest by source text."""
+        pending: Dict[str, List[TranscriptSegment]] = {}
+        for segment in segments:
+            text = segment.text.strip()
+            cached = self._cache.get(self._cache_key(text)) if self._cache is not None and text not in pending else None
+            if cached is not None:
+                segment.translation = cached
+                self._cache_hits += 1
+            else:
+                pending.setdefault(text, []).append(segment)
+        return pending
+
+    async def _translate_pending(self, batch: List[str], pending: Dict[str, List[TranscriptSegment]]) -> None:
+        async with self._semaphore:
+            translations = await self._atranslate_batch(batch)
+        if translations is None:
+            # 先释放并发名额，再让每一条像普通请求一样排队，坏掉的一批不会长期占住一个名额
+            await asyncio.gather(*(self._translate_pending([text], pending) for text in batch))
+            return
+        for text, translation in zip(batch, translations):
+            for segment in pending[text]:
+                segment.translation = translation
+        if self._cache is not None:
+            self._cache.put_many({self._cache_key(text): translation for text, translation in zip(batch, translations)})
+        previous = self._completed
+        self._completed += sum(len(pending[text]) for text in batch)
+        if (previous == 0 or self._completed // 10 > previous // 10) and logger.isEnabledFor(logging.INFO):
+            logger.info("%s: %s segments processed", self.progress_label, self._completed)
+
+    def _cache_key(self, text: str) -> str:
+        return hashlib.sha1(f"{self.config.model}|{DEFAULT_PROMPT_PREFIX}|{text}".encode("utf-8")).hexdigest()
+
+    async def _atranslate_batch(self, texts: List[str]) -> Optional[List[str]]:
+        """Translate several lines with one request; None when the reply cannot be parsed."""
+        if len(texts) == 1:
+            return [await self._atranslate_text(texts[0])]
+        lines = json.dumps([{"id": idx, "en": text.strip()} for idx, text in enumerate(texts)], ensure_ascii=False)
+        content = await self._acomplete(BATCH_PROMPT_PREFIX + lines, json_output=True)
+        try:
+            return self._parse_batch(content, expected=len(texts))
+        except (ValueError, KeyError, TypeError) as exc:
+            logger.warning("Could not parse batch translation of %s segments (%s); translating one by one", len(texts), exc)
+        return None
+
+    async def _atranslate_text(self, text: str) -> str:
+        content = await self._acomplete(DEFAULT_PROMPT_PREFIX + text.strip())
+        logger.debug("Translation result: %s -> %s", text, content)
+        return content
+
+    @staticmethod
+    def _parse_batch(content: str, expected: int) -> List[str]:
+        items = json.loads(content)["translations"]
+        translations = {int(item["id"]): str(item["zh"]).strip() for item in items}
+        missing = [idx for idx in range(expected) if not translations.get(idx)]
+        if missing:
+            raise ValueError(f"missing translations for ids {missing}")
+        return [translations[idx] for idx in range(expected)]
+
+    def _open_client(self):
+        """Async context manager holding the HTTP client shared by concurrent requests."""
+        raise NotImplementedError
+
+    async def _acomplete(self, prompt: str, json_output: bool = False) -> str:
         raise NotImplementedError
 
 
@@ -46,43 +180,55 @@ class OpenAITranslator(BaseTranslator):
             api_key = os.getenv(config.api_key_env)
             if api_key:
                 kwargs["api_key"] = api_key
-        self.client = client or OpenAI(**kwargs)
+        if client is not None:
+            # 异步客户端复用同步客户端的凭据与地址
+            kwargs.setdefault("api_key", client.api_key)
+            kwargs.setdefault("base_url", client.base_url)
+        if "api_key" not in kwargs and not os.getenv("OPENAI_API_KEY"):
+            raise RuntimeError(
+                f"OpenAI API key not found. Please set environment variable '{config.api_key_env or 'OPENAI_API_KEY'}'."
+            )
+        self._client_kwargs = kwargs
+        self.aclient: Optional[AsyncOpenAI] = None
 
-    def translate_segments(self, segments: Iterable[TranscriptSegment]) -> List[TranscriptSegment]:
-        translated: List[TranscriptSegment] = []
-        for idx, segment in enumerate(segments, start=1):
-            segment.translation = self._translate_text(segment.text)
-            if idx == 1 or idx % 10 == 0:
-                logger.info("Translation progress: %s segments processed", idx)
-            translated.append(segment)
-        return translated
+    @asynccontextmanager
+    async def _open_client(self) -> AsyncIterator[None]:
+        # 每个事件循环创建独立的异步客户端，避免连接池跨循环复用
+        http_client = openai_http_client(self.config.max_concurrency)
+        async with AsyncOpenAI(**self._client_kwargs, http_client=http_client) as aclient:
+            self.aclient = aclient
+            try:
+                yield
+            finally:
+                self.aclient = None
 
-    def _translate_text(self, text: str) -> str:
-        prompt = DEFAULT_PROMPT_PREFIX + text.strip()
+    async def _acomplete(self, prompt: str, json_output: bool = False) -> str:
+        extra = {"text": {"format": {"type": "json_object"}}} if json_output else {}
         for attempt in range(1, self.config.max_retries + 1):
             try:
-                response = self.client.responses.create(
+                response = await self.aclient.responses.create(
                     model=self.config.model,
                     input=[
                         {"role": "system", "content": "You are a professional bilingual translation assistant."},
                         {"role": "user", "content": [{"type": "text", "text": prompt}]},
                     ],
                     temperature=self.config.temperature,
+                    **extra,
                 )
-                content = response.output[0].content[0].text.strip()
-                logger.debug("Translation result: %s -> %s", text, content)
-                return content
+                return response.output[0].content[0].text.strip()
             except APIError as exc:
                 logger.warning("Translation attempt %s failed: %s", attempt, exc)
                 if attempt >= self.config.max_retries:
                     raise
-                time.sleep(self.config.retry_delay)
+                await asyncio.sleep(self.config.retry_delay)
         raise RuntimeError("Unreachable translation retry loop")
 
 
 class DeepSeekTranslator(BaseTranslator):
     """Translate transcript segments via the DeepSeek REST API."""
 
+    progress_label = "Translation progress (DeepSeek)"
+
     def __init__(self, config: TranslationConfig):
         self.config = config
         env_key = config.api_key_env or "DEEPSEEK_API_KEY"
@@ -90,20 +236,29 @@ class DeepSeekTranslator(BaseTranslator):
         if not self.api_key:
             raise RuntimeError(f"DeepSeek API key not found. Please set environment variable '{env_key}'.")
         self.base_url = (config.api_base or "https://api.deepseek.com").rstrip("/")
+        self.http: Optional[aiohttp.ClientSession] = None
 
-    def translate_segments(self, segments: Iterable[TranscriptSegment]) -> List[TranscriptSegment]:
-        translated: List[TranscriptSegment] = []
-        for idx, segment in enumerate(segments, start=1):
-            segment.translation = self._translate_text(segment.text)
-            if idx == 1 or idx % 10 == 0:
-                logger.info("Translation progress (DeepSeek): %s segments processed", idx)
-            translated.append(segment)
-        return translated
+    @asynccontextmanager
+    async def _open_client(self) -> AsyncIterator[None]:
+        # 所有并发请求共用一个 ClientSession；连接池按并发数预留连接，
+        # 长时间保持 keep-alive 并缓存 DNS，批次之间不再重复 TCP/TLS 握手
+        headers = {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
+        connector = aiohttp.TCPConnector(
+            limit=max(1, self.config.max_concurrency) * 2,
+            keepalive_timeout=90,
+            ttl_dns_cache=300,
+        )
+        async with aiohttp.ClientSession(
+            headers=headers, connector=connector, timeout=aiohttp.ClientTimeout(total=60)
+        ) as http:
+            self.http = http
+            try:
+                yield
+            finally:
+                self.http = None
 
-    def _translate_text(self, text: str) -> str:
-        prompt = DEFAULT_PROMPT_PREFIX + text.strip()
+    async def _acomplete(self, prompt: str, json_output: bool = False) -> str:
         url = f"{self.base_url}/v1/chat/completions"
-        headers = {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
         payload = {
             "model": self.config.model or "deepseek-chat",
             "messages": [
@@ -112,21 +267,22 @@ class DeepSeekTranslator(BaseTranslator):
             ],
             "temperature": self.config.temperature,
         }
+        if json_output:
+            payload["response_format"] = {"type": "json_object"}
         for attempt in range(1, self.config.max_retries + 1):
             try:
-                response = requests.post(url, headers=headers, json=payload, timeout=60)
-                if response.status_code >= 400:
-                    logger.warning("DeepSeek translation failed (HTTP %s): %s", response.status_code, response.text)
-                    raise RuntimeError(response.text)
-                data = response.json()
-                content = data["choices"][0]["message"]["content"].strip()
-                logger.debug("DeepSeek translation result: %s -> %s", text, content)
-                return content
+                async with self.http.post(url, json=payload) as response:
+                    if response.status >= 400:
+                        body = await response.text()
+                        logger.warning("DeepSeek translation failed (HTTP %s): %s", response.status, body)
+                        raise RuntimeError(body)
+                    data = await response.json()
+                return data["choices"][0]["message"]["content"].strip()
             except Exception as exc:  # broad to include network errors
                 logger.warning("DeepSeek translation attempt %s failed: %s", attempt, exc)
                 if attempt >= self.config.max_retries:
                     raise
-                time.sleep(self.config.retry_delay)
+                await asyncio.sleep(self.config.retry_delay)
         raise RuntimeError("Unreachable translation retry loop")
 
 
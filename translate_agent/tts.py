@@ -1,36 +1,372 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import io
+import json
 import logging
 import os
-import time
+import random
+import shutil
+import uuid
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar, Union
 
-from openai import OpenAI
+import numpy as np
+from openai import AsyncOpenAI, OpenAI
 
 try:
-    from openai import APIError  # type: ignore
+    from openai import APIConnectionError, RateLimitError  # type: ignore
+    # 只有限流、连接失败和超时（APITimeoutError 是 APIConnectionError 的子类）值得重试，
+    # 鉴权、参数错误等 4xx 重试也不会成功
+    RETRYABLE_ERRORS = (RateLimitError, APIConnectionError)
 except ImportError:  # Backwards compat for older SDKs
-    class APIError(Exception):
-        pass
+    from openai import APIError  # type: ignore
+
+    RETRYABLE_ERRORS = (APIError,)
 
+from .audio import decode_audio_bytes, split_at_silences, write_audio
 from .config import TTSConfig
 from .types import TranscriptSegment
+from .utils import openai_http_client, run_async
 
 logger = logging.getLogger(__name__)
 
+STREAM_CHUNK_SIZE = 1 << 16
+MAX_RETRY_DELAY = 30.0
+BATCH_SEPARATOR = "\n\n"
+
+T = TypeVar("T")
+
 
 class BaseTTS:
+    config: TTSConfig
+    progress_label = "TTS progress"
+    concurrency: Optional[int] = None  # 覆盖 config.tts_concurrency
+
     def synthesize_segments(self, segments: Iterable[TranscriptSegment], output_dir: Path) -> None:
+        segments = list(segments)
+        run_async(self._asynthesize_segments(segments, output_dir))
+
+    async def _asynthesize_segments(self, segments: List[TranscriptSegment], output_dir: Path) -> None:
+        if any(not segment.translation for segment in segments):
+            raise ValueError("Segment must include translation text before TTS synthesis.")
+        async with self.session():
+            await self.asynthesize_batch(list(enumerate(segments, start=1)), output_dir)
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[None]:
+        """Open the client and concurrency limit shared by `asynthesize` calls."""
+        self._semaphore = asyncio.Semaphore(max(1, self.concurrency or self.config.tts_concurrency))
+        self._completed = 0
+        self._cache_hits = 0
+        self._reused = 0
+        self._resumed = 0
+        self._output_dirs: set = set()
+        # 译文 -> 首次合成的 Future（结果为 (分段文件, 解码音频)），同一译文在本次运行中只合成一次
+        self._inflight: Dict[str, asyncio.Future] = {}
+        try:
+            async with self._open_client():
+                yield
+        finally:
+            if self._cache_hits:
+                logger.info("%s: %s segments served from TTS cache", self.progress_label, self._cache_hits)
+            if self._reused:
+                logger.info("%s: %s segments reused identical translations", self.progress_label, self._reused)
+            if self._resumed:
+                logger.info("%s: %s segment files already present from a previous run", self.progress_label, self._resumed)
+        # 只在正常结束时淘汰缓存，避免淘汰过程中的错误掩盖合成失败的原始异常
+        if self.config.cache_dir is not None:
+            await asyncio.to_thread(self._evict_cache)
+
+    async def asynthesize(self, idx: int, segment: TranscriptSegment, output_dir: Path) -> None:
+        """Synthesize one segment into `output_dir`; must run inside `session()`."""
+        if not segment.translation:
+            raise ValueError("Segment must include translation text before TTS synthesis.")
+        await self._ensure_output_dir(output_dir)
+        existing = self._inflight.get(segment.translation)
+        if existing is not None:
+            await self._reuse(existing, idx, segment, output_dir)
+            return
+        future = self._claim(segment.translation)
+        await self._settle(future, self._synthesize_segment(idx, segment, output_dir))
+
+    async def _synthesize_segment(
+        self, idx: int, segment: TranscriptSegment, output_dir: Path
+    ) -> Tuple[Optional[Path], Optional[Tuple[np.ndarray, int]]]:
+        if not self.config.keep_segment_files:
+            # 不保留分段文件时，音频只在内存中接收、解码，直接交给混音
+            segment.tts_path = None
+            decoded = await self._cached_synthesize_in_memory(segment.translation)
+            self._mark_synthesized(segment, decoded)
+            return None, decoded
+        filename = self._segment_path(idx, segment.translation, output_dir)
+        # 文件名只由序号和内容决定，提交前即可写回片段，与完成顺序无关
+        segment.tts_path = filename
+        if await asyncio.to_thread(_is_complete, filename):
+            # 上次运行已生成同一内容的文件（译文或音色改变时文件名也会改变），直接复用
+            self._resumed += 1
+            self._mark_synthesized(segment, None)
+            return filename, None
+        # 先写到临时文件，完整写完再改名：中断或失败时不会在内容哈希文件名下留下残缺文件，
+        # 否则之后的运行会把它当作已完成的片段复用
+        partial = _partial_path(filename)
+        try:
+            decoded = await self._cached_synthesize(segment.translation, partial)
+            await asyncio.to_thread(os.replace, partial, filename)
+        except BaseException:
+            # 被取消时不能再 await，直接同步删除临时文件
+            partial.unlink(missing_ok=True)
+            raise
+        self._mark_synthesized(segment, decoded)
+        return filename, decoded
+
+    def _claim(self, text: str) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[text] = future
+        return future
+
+    @staticmethod
+    async def _settle(future: asyncio.Future, work: Awaitable[Tuple[Optional[Path], Optional[Tuple[np.ndarray, int]]]]) -> None:
+        """Run ``work`` and publish its result to segments waiting on the same translation."""
+        try:
+            result = await work
+        except BaseException as exc:
+            _fail(future, exc)
+            raise
+        future.set_result(result)
+
+    async def _reuse(self, future: asyncio.Future, idx: int, segment: TranscriptSegment, output_dir: Path) -> None:
+        """Give ``segment`` the audio already synthesized for an identical translation."""
+        master_path, decoded = await asyncio.shield(future)
+        if self.config.keep_segment_files and master_path is not None:
+            filename = self._segment_path(idx, segment.translation, output_dir)
+            segment.tts_path = filename
+            # 下游只读取这些文件，硬链接到同一份音频即可
+            if not await asyncio.to_thread(_is_complete, filename):
+                await asyncio.to_thread(_link_or_copy, master_path, filename)
+        else:
+            segment.tts_path = None
+        self._reused += 1
+        self._mark_synthesized(segment, decoded)
+
+    def synthesize_to_stream(self, text: str) -> AsyncIterator[bytes]:
+        """Yield the encoded audio for ``text`` chunk by chunk as it arrives."""
+        raise NotImplementedError
+
+    async def _synthesize_bytes(self, text: str) -> bytes:
+        """Receive the whole encoded clip for ``text`` into memory."""
+        buffer = io.BytesIO()
+        async for chunk in self.synthesize_to_stream(text):
+            buffer.write(chunk)
+        return buffer.getvalue()
+
+    async def asynthesize_batch(self, items: List[Tuple[int, TranscriptSegment]], output_dir: Path) -> None:
+        """Synthesize several ``(idx, segment)`` pairs; must run inside `session()`."""
+        await self._ensure_output_dir(output_dir)
+        await asyncio.gather(*(self.asynthesize(idx, segment, output_dir) for idx, segment in items))
+
+    async def synthesize_stream(
+        self, items: AsyncIterable[Tuple[int, TranscriptSegment]], output_dir: Path
+    ) -> AsyncIterator[Tuple[int, TranscriptSegment]]:
+        """Synthesize ``(idx, segment)`` pairs as they arrive and yield them, in arrival order, once done.
+
+        Must run inside `session()`. Items that are already waiting are submitted together
+        through `asynthesize_batch` (up to ``config.batch_size``), and at most ``concurrency``
+        submissions are in flight, which also bounds how far ahead ``items`` is read.
+        """
+        await self._ensure_output_dir(output_dir)
+        limit = max(1, self.concurrency or self.config.tts_concurrency)
+        chunk_size = max(1, self.config.batch_size)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=limit * chunk_size)
+        end = object()
+
+        async def feed() -> None:
+            try:
+                async for item in items:
+                    await queue.put(item)
+            except asyncio.CancelledError:
+                # 被取消时不写结束标记：队列已满时 put 会一直阻塞，取消后也没有人再读取
+                raise
+            except BaseException:
+                await queue.put(end)
+                raise
+            await queue.put(end)
+
+        feeder = asyncio.ensure_future(feed())
+        chunks: Dict[asyncio.Future, int] = {}
+        order: List[List[Tuple[int, TranscriptSegment]]] = []
+        ready = set()
+        next_out = 0
+        finished = False
+        getter: Optional[asyncio.Future] = None
+        try:
+            while not finished or chunks:
+                if not finished and len(chunks) < limit and getter is None:
+                    getter = asyncio.ensure_future(queue.get())
+                waiting = set(chunks) | ({getter} if getter is not None else set())
+                done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                if getter is not None and getter.done():
+                    # 取出一个之后把队列里已就绪的片段一起提交，支持合并请求的后端可以放进同一次合成
+                    chunk = []
+                    item = getter.result()
+                    getter = None
+                    while item is not end:
+                        chunk.append(item)
+                        if len(chunk) >= chunk_size or queue.empty():
+                            break
+                        item = queue.get_nowait()
+                    finished = item is end
+                    if chunk:
+                        task = asyncio.ensure_future(self.asynthesize_batch(chunk, output_dir))
+                        chunks[task] = len(order)
+                        order.append(chunk)
+                for task in done:
+                    if task in chunks:
+                        task.result()
+                        ready.add(chunks.pop(task))
+                # 按到达顺序输出：前面的片段未完成时，已完成的后续片段先缓存
+                while next_out in ready:
+                    ready.discard(next_out)
+                    for item in order[next_out]:
+                        yield item
+                    order[next_out] = []
+                    next_out += 1
+            await feeder
+        finally:
+            leftover = [task for task in [*chunks, getter, feeder] if task is not None]
+            for task in leftover:
+                task.cancel()
+            # 等待所有剩余任务结束并取走其异常，失败的片段不会再报 "Task exception was never retrieved"
+            await asyncio.gather(*leftover, return_exceptions=True)
+
+    async def _ensure_output_dir(self, output_dir: Path) -> None:
+        # 每个会话中同一目录只创建一次；只在内存中合成时不写分段文件，无需创建
+        if not self.config.keep_segment_files or output_dir in self._output_dirs:
+            return
+        await asyncio.to_thread(output_dir.mkdir, parents=True, exist_ok=True)
+        self._output_dirs.add(output_dir)
+
+    def _segment_path(self, idx: int, text: str, output_dir: Path) -> Path:
+        """Segment file named by position and content, so reruns can keep files whose audio is unchanged."""
+        return output_dir / f"{idx:04d}_{self._content_key(text)[:16]}.{self.config.format}"
+
+    def _mark_synthesized(self, segment: TranscriptSegment, decoded: Optional[Tuple[np.ndarray, int]]) -> None:
+        if decoded is not None:
+            segment.tts_audio, segment.tts_sample_rate = decoded
+        # 按完成顺序计数，日志反映实际吞吐而不是提交进度
+        self._completed += 1
+        if (self._completed == 1 or self._completed % 10 == 0) and logger.isEnabledFor(logging.INFO):
+            logger.info("%s: %s segments synthesized", self.progress_label, self._completed)
+
+    async def _cached_synthesize(self, text: str, output_path: Path) -> Optional[Tuple[np.ndarray, int]]:
+        """Serve ``output_path`` from the on-disk cache, synthesizing and storing it on a miss."""
+        if self.config.cache_dir is None:
+            async with self._semaphore:
+                return await self._synthesize_to_file(text, output_path)
+        cached = self._cache_path(text)
+        # 命中时更新 mtime，淘汰时按最近使用时间保留；文件操作放到线程中，不阻塞事件循环
+        if await asyncio.to_thread(_touch, cached):
+            await asyncio.to_thread(_link_or_copy, cached, output_path)
+            self._cache_hits += 1
+            return None
+        async with self._semaphore:
+            decoded = await self._synthesize_to_file(text, output_path)
+        await asyncio.to_thread(self._store_cached, text, output_path)
+        return decoded
+
+    async def _cached_synthesize_in_memory(self, text: str) -> Tuple[np.ndarray, int]:
+        """Like `_cached_synthesize`, but returns the decoded clip without writing a segment file."""
+        cached = self._cache_path(text) if self.config.cache_dir is not None else None
+        data = await asyncio.to_thread(_read_cached, cached) if cached is not None else None
+        if data is not None:
+            self._cache_hits += 1
+        else:
+            async with self._semaphore:
+                data = await self._synthesize_bytes(text)
+            if cached is not None:
+                await asyncio.to_thread(self._store_cached, text, lambda tmp_path: tmp_path.write_bytes(data))
+        return await asyncio.to_thread(decode_audio_bytes, data)
+
+    def _store_cached(self, text: str, source: Union[Path, Callable[[Path], object]]) -> None:
+        """Store a finished clip in the cache, from a file or a callable writing to the given path."""
+        if self.config.cache_dir is None:
+            return
+        cached = self._cache_path(text)
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        # 先写到临时文件再 os.replace，并发写入与中断都不会留下不完整的缓存
+        if isinstance(source, Path):
+            _link_or_copy(source, cached)
+        else:
+            _write_atomically(cached, source)
+
+    def _cache_params(self) -> Dict[str, object]:
+        """Synthesis parameters that change the produced audio, used in the cache key."""
+        return {"provider": self.config.provider, "format": self.config.format}
+
+    def _content_key(self, text: str) -> str:
+        params = json.dumps(self._cache_params(), sort_keys=True).encode("utf-8")
+        return hashlib.sha256(params + text.encode("utf-8")).hexdigest()
+
+    def _cache_path(self, text: str) -> Path:
+        key = self._content_key(text)
+        return self.config.cache_dir / key[:2] / f"{key}.{self.config.format}"
+
+    def _evict_cache(self) -> None:
+        """Delete least recently used cache files until the cache fits in ``cache_max_bytes``."""
+        # 缓存目录在第一次写入时才创建，本次没有写入任何缓存时可能不存在
+        if not self.config.cache_dir.is_dir():
+            return
+        entries = []
+        for bucket in os.scandir(self.config.cache_dir):
+            if not bucket.is_dir():
+                continue
+            for entry in os.scandir(bucket.path):
+                if entry.is_file() and ".tmp-" not in entry.name:
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        if total <= self.config.cache_max_bytes:
+            return
+        entries.sort()
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.config.cache_max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            total -= size
+            removed += 1
+        logger.info("Evicted %s files from TTS cache %s", removed, self.config.cache_dir)
+
+    @asynccontextmanager
+    async def _open_client(self) -> AsyncIterator[None]:
+        """Async context manager holding resources shared by concurrent requests."""
+        yield
+
+    async def _synthesize_to_file(self, text: str, output_path: Path) -> Optional[Tuple[np.ndarray, int]]:
+        """Write the audio for ``text``; may also return it decoded as (mono int16, sample rate)."""
         raise NotImplementedError
 
 
 class OpenAITTS(BaseTTS):
     """Use OpenAI's TTS models to generate Chinese speech audio segments."""
 
-    def __init__(self, config: TTSConfig, client: Optional[OpenAI] = None, max_retries: int = 3, retry_delay: float = 3.0):
+    progress_label = "TTS progress (OpenAI)"
+
+    def __init__(
+        self,
+        config: TTSConfig,
+        client: Optional[OpenAI] = None,
+        max_retries: int = 3,
+        retry_delay: float = 3.0,
+        concurrency: Optional[int] = None,
+    ):
         self.config = config
+        self.concurrency = concurrency
         if client is not None and config.api_base:
             logger.warning("Ignoring provided OpenAI client because custom api_base was supplied.")
             client = None
@@ -41,45 +377,192 @@ class OpenAITTS(BaseTTS):
             api_key = os.getenv(config.api_key_env)
             if api_key:
                 kwargs["api_key"] = api_key
-        self.client = client or OpenAI(**kwargs)
+        if client is not None:
+            # 异步客户端复用同步客户端的凭据与地址
+            kwargs.setdefault("api_key", client.api_key)
+            kwargs.setdefault("base_url", client.base_url)
+        if "api_key" not in kwargs and not os.getenv("OPENAI_API_KEY"):
+            raise RuntimeError(
+                f"OpenAI API key not found. Please set environment variable '{config.api_key_env or 'OPENAI_API_KEY'}'."
+            )
+        self._client_kwargs = kwargs
+        self.aclient: Optional[AsyncOpenAI] = None
         self.max_retries = max_retries
         self.retry_delay = retry_delay
 
-    def synthesize_segments(self, segments: Iterable[TranscriptSegment], output_dir: Path) -> None:
-        output_dir.mkdir(parents=True, exist_ok=True)
-        for idx, segment in enumerate(segments, start=1):
-            if not segment.translation:
-                raise ValueError("Segment must include translation text before TTS synthesis.")
-            filename = output_dir / f"segment_{idx:04d}.{self.config.format}"
-            self._synthesize_to_file(segment.translation, filename)
-            segment.tts_path = filename
-            if idx == 1 or idx % 10 == 0:
-                logger.info("TTS progress (OpenAI): %s segments synthesized", idx)
+    def _cache_params(self) -> Dict[str, object]:
+        return {
+            **super()._cache_params(),
+            "model": self.config.model,
+            "voice": self.config.voice,
+            "speaking_rate": self.config.speaking_rate,
+        }
 
-    def _synthesize_to_file(self, text: str, output_path: Path) -> None:
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        for attempt in range(1, self.max_retries + 1):
+    @asynccontextmanager
+    async def _open_client(self) -> AsyncIterator[None]:
+        # 每个事件循环创建独立的异步客户端，避免连接池跨循环复用
+        http_client = openai_http_client(self.concurrency or self.config.tts_concurrency)
+        async with AsyncOpenAI(**self._client_kwargs, http_client=http_client) as aclient:
+            self.aclient = aclient
             try:
-                with self.client.audio.speech.with_streaming_response.create(
-                    model=self.config.model,
-                    voice=self.config.voice,
-                    input=text,
-                    format=self.config.format,
-                    voice_settings={"speaking_rate": self.config.speaking_rate},
-                ) as response:
-                    response.stream_to_file(output_path)
-                logger.debug("Generated TTS segment at %s", output_path)
+                yield
+            finally:
+                self.aclient = None
+
+    async def asynthesize_batch(self, items: List[Tuple[int, TranscriptSegment]], output_dir: Path) -> None:
+        """Synthesize short segments several per request when ``config.batch_size`` > 1."""
+        if self.config.batch_size <= 1:
+            await super().asynthesize_batch(items, output_dir)
+            return
+        await self._ensure_output_dir(output_dir)
+        # 缓存与分段文件的检查在线程中一次完成，不在事件循环里逐个访问磁盘
+        available = await asyncio.to_thread(self._available_indices, items, output_dir)
+        singles = []
+        groups = []
+        group: List[Tuple[int, TranscriptSegment]] = []
+        grouped = set()
+        for idx, segment in items:
+            text = segment.translation or ""
+            cached = idx in available
+            # 长句、已缓存（或上次运行已生成）或重复的片段仍走单独流程，避免一个长句拖慢整组或重复合成
+            if not text or cached or len(text) > self.config.batch_max_chars or text in self._inflight or text in grouped:
+                singles.append((idx, segment))
+                continue
+            grouped.add(text)
+            group.append((idx, segment))
+            if len(group) == self.config.batch_size:
+                groups.append(group)
+                group = []
+        if group:
+            groups.append(group)
+        # 先登记整组译文，重复的单独片段会等待分组结果而不是另发请求
+        futures = {text: self._claim(text) for text in grouped}
+        await asyncio.gather(
+            *(self._asynthesize_group(group, futures, output_dir) for group in groups),
+            *(self.asynthesize(idx, segment, output_dir) for idx, segment in singles),
+        )
+
+    def _available_indices(self, items: List[Tuple[int, TranscriptSegment]], output_dir: Path) -> set:
+        """Indices whose audio is already cached or left in ``output_dir`` by a previous run."""
+        available = set()
+        for idx, segment in items:
+            text = segment.translation or ""
+            if (self.config.cache_dir is not None and self._cache_path(text).exists()) or (
+                self.config.keep_segment_files and _is_complete(self._segment_path(idx, text, output_dir))
+            ):
+                available.add(idx)
+        return available
+
+    async def _asynthesize_group(
+        self,
+        group: List[Tuple[int, TranscriptSegment]],
+        futures: Dict[str, asyncio.Future],
+        output_dir: Path,
+    ) -> None:
+        """Synthesize a group with one request and cut the audio back into segments at its pauses."""
+
+        async def one_by_one() -> None:
+            await asyncio.gather(
+                *(
+                    self._settle(futures[segment.translation], self._synthesize_segment(idx, segment, output_dir))
+                    for idx, segment in group
+                )
+            )
+
+        if len(group) == 1:
+            await one_by_one()
+            return
+        # 段落之间的换行会让模型停顿，再按停顿切分回各个片段
+        text = BATCH_SEPARATOR.join(segment.translation.strip() for _, segment in group)
+        try:
+            async with self._semaphore:
+                data = await self._request_audio(text)
+            pcm, sample_rate = await asyncio.to_thread(decode_audio_bytes, data)
+            # 各段时长应与译文长度大致成比例，否则说明切分点落在了句内停顿上
+            weights = [len(segment.translation.strip()) for _, segment in group]
+            pieces = split_at_silences(pcm, sample_rate, len(group), weights=weights)
+            if pieces is None:
+                logger.debug("Could not split batched TTS audio into %s segments; synthesizing one by one", len(group))
+                await one_by_one()
                 return
-            except APIError as exc:
-                logger.warning("TTS attempt %s failed: %s", attempt, exc)
+            for (idx, segment), piece in zip(group, pieces):
+                if self.config.keep_segment_files:
+                    filename = self._segment_path(idx, segment.translation, output_dir)
+                    segment.tts_path = filename
+                    await asyncio.to_thread(
+                        _write_atomically,
+                        filename,
+                        lambda tmp_path, piece=piece: write_audio(piece, sample_rate, tmp_path),
+                    )
+                    await asyncio.to_thread(self._store_cached, segment.translation, filename)
+                elif self.config.cache_dir is not None:
+                    await asyncio.to_thread(
+                        self._store_cached,
+                        segment.translation,
+                        lambda tmp_path, piece=piece: write_audio(piece, sample_rate, tmp_path),
+                    )
+                self._mark_synthesized(segment, (piece, sample_rate))
+                futures[segment.translation].set_result((segment.tts_path, (piece, sample_rate)))
+        except BaseException as exc:
+            for _, segment in group:
+                _fail(futures[segment.translation], exc)
+            raise
+
+    async def _request_audio(self, text: str) -> bytes:
+        async def call() -> bytes:
+            response = await self.aclient.audio.speech.create(**self._speech_params(text, response_format="wav"))
+            return response.read()
+
+        return await self._with_retries(call)
+
+    async def synthesize_to_stream(self, text: str) -> AsyncIterator[bytes]:
+        async with self.aclient.audio.speech.with_streaming_response.create(**self._speech_params(text)) as response:
+            async for chunk in response.iter_bytes(STREAM_CHUNK_SIZE):
+                yield chunk
+
+    async def _synthesize_bytes(self, text: str) -> bytes:
+        return await self._with_retries(lambda: super(OpenAITTS, self)._synthesize_bytes(text))
+
+    def _speech_params(self, text: str, response_format: Optional[str] = None) -> Dict[str, object]:
+        """Keyword arguments for ``audio.speech.create``."""
+        return {
+            "model": self.config.model,
+            "voice": self.config.voice,
+            "input": text,
+            "response_format": response_format or self.config.format,
+            "speed": self.config.speaking_rate,
+        }
+
+    async def _synthesize_to_file(self, text: str, output_path: Path) -> None:
+        async def call() -> None:
+            async with self.aclient.audio.speech.with_streaming_response.create(**self._speech_params(text)) as response:
+                # 按 64 KB 合并网络分块再写盘，避免每个小分块都触发一次线程切换和 write 调用
+                await response.stream_to_file(output_path, chunk_size=STREAM_CHUNK_SIZE)
+
+        await self._with_retries(call)
+        logger.debug("Generated TTS segment at %s", output_path)
+
+    async def _with_retries(self, call: Callable[[], Awaitable[T]]) -> T:
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                return await call()
+            except RETRYABLE_ERRORS as exc:
                 if attempt >= self.max_retries:
                     raise
-                time.sleep(self.retry_delay)
+                delay = _retry_after_seconds(exc)
+                if delay is None:
+                    # 指数退避并加入随机抖动，避免并发请求在限流后同时重试
+                    delay = min(self.retry_delay * 2 ** (attempt - 1), MAX_RETRY_DELAY) + random.uniform(0, 0.5)
+                logger.warning("TTS attempt %s failed: %s; retrying in %.1fs", attempt, exc, delay)
+                await asyncio.sleep(delay)
+        raise RuntimeError("Unreachable TTS retry loop")
 
 
 class EdgeTTS(BaseTTS):
     """Use Microsoft Edge neural voices without requiring Azure credentials."""
 
+    progress_label = "TTS progress (Edge)"
+
     def __init__(self, config: TTSConfig):
         try:
             import edge_tts  # type: ignore
@@ -87,20 +570,18 @@ class EdgeTTS(BaseTTS):
             raise RuntimeError("edge-tts package is required for Edge TTS provider.") from exc
         self.edge_tts = edge_tts
         self.config = config
+        # Edge 的每个请求是一条独立的 websocket，可以比 OpenAI 承受更高的并发
+        self.concurrency = config.edge_concurrency
 
-    def synthesize_segments(self, segments: Iterable[TranscriptSegment], output_dir: Path) -> None:
-        output_dir.mkdir(parents=True, exist_ok=True)
-        for idx, segment in enumerate(segments, start=1):
-            if not segment.translation:
-                raise ValueError("Segment must include translation text before TTS synthesis.")
-            filename = output_dir / f"segment_{idx:04d}.{self.config.format}"
-            # 在Jupyter/Colab环境中使用兼容的方式运行异步代码
-            self._run_async(self._synthesize_to_file(segment.translation, filename))
-            segment.tts_path = filename
-            if idx == 1 or idx % 10 == 0:
-                logger.info("TTS progress (Edge): %s segments synthesized", idx)
+    def _cache_params(self) -> Dict[str, object]:
+        return {
+            **super()._cache_params(),
+            "voice": self.config.edge_voice,
+            "rate": self.config.edge_rate,
+            "volume": self.config.edge_volume,
+        }
 
-    async def _synthesize_to_file(self, text: str, output_path: Path) -> None:
+    async def synthesize_to_stream(self, text: str) -> AsyncIterator[bytes]:
         # 移除不兼容的output_format参数
         communicate = self.edge_tts.Communicate(
             text=text,
@@ -109,34 +590,95 @@ class EdgeTTS(BaseTTS):
             volume=self.config.edge_volume
             # output_format参数已移除，因为它不被当前版本的edge-tts支持
         )
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, "wb") as outfile:
-            async for chunk in communicate.stream():
-                if chunk["type"] == "audio":
-                    outfile.write(chunk["data"])
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                yield chunk["data"]
+
+    async def _synthesize_to_file(self, text: str, output_path: Path) -> Tuple[np.ndarray, int]:
+        # 音频块先收集在内存中，一次写盘并直接在内存里解码，混音时无需再读取、解码 mp3
+        data = await self._synthesize_bytes(text)
+        # 写盘在线程中完成，并发的其他 websocket 流可以继续接收
+        await asyncio.to_thread(output_path.write_bytes, data)
         logger.debug("Generated Edge TTS segment at %s", output_path)
+        return await asyncio.to_thread(decode_audio_bytes, data)
+
+
+def _retry_after_seconds(exc: Exception) -> Optional[float]:
+    """Delay requested by the server's Retry-After header, if the error carries one."""
+    response = getattr(exc, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return min(float(value), MAX_RETRY_DELAY) if value is not None else None
+    except ValueError:
+        # HTTP 日期格式的 Retry-After 不解析，退回指数退避
+        return None
+
+
+def _fail(future: asyncio.Future, exc: BaseException) -> None:
+    if future.done():
+        return
+    if isinstance(exc, asyncio.CancelledError):
+        future.cancel()
+        return
+    future.set_exception(exc)
+    # 没有其他片段等待时也不要产生 "exception was never retrieved" 警告
+    future.exception()
+
+
+def _touch(path: Path) -> bool:
+    """Refresh the mtime of ``path``; False when it does not exist."""
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def _read_cached(path: Path) -> Optional[bytes]:
+    if not _touch(path):
+        return None
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        # 读取前被并发的淘汰删除，按未命中处理
+        return None
 
-    def _run_async(self, coroutine) -> None:
-        """在Jupyter/Colab环境中兼容性运行异步代码"""
+
+def _is_complete(path: Path) -> bool:
+    try:
+        return path.stat().st_size > 0
+    except OSError:
+        return False
+
+
+def _partial_path(path: Path) -> Path:
+    """Temporary sibling of ``path`` that keeps its extension, so format-by-suffix writers still work."""
+    return path.with_name(f"{path.stem}.tmp-{os.getpid()}-{uuid.uuid4().hex[:8]}{path.suffix}")
+
+
+def _write_atomically(target: Path, write: Callable[[Path], object]) -> None:
+    """Let ``write`` produce a temporary file, then move it over ``target`` in one step."""
+    tmp_path = _partial_path(target)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, target)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _link_or_copy(source: Path, target: Path) -> None:
+    """Hard-link ``source`` to ``target`` (replacing it), copying when linking is not possible."""
+
+    def link(tmp_path: Path) -> None:
         try:
-            # 尝试使用nest_asyncio解决Jupyter环境中的事件循环问题
-            import nest_asyncio
-            nest_asyncio.apply()
-            # 直接await协程
-            asyncio.run(coroutine)
-        except ImportError:
-            # 如果没有安装nest_asyncio，则使用传统方法
-            try:
-                # 尝试获取当前运行的事件循环
-                loop = asyncio.get_event_loop()
-                loop.run_until_complete(coroutine)
-            except RuntimeError:
-                # 如果没有运行中的事件循环，则创建新的
-                loop = asyncio.new_event_loop()
-                try:
-                    loop.run_until_complete(coroutine)
-                finally:
-                    loop.close()
+            os.link(source, tmp_path)
+        except OSError:
+            # 跨文件系统或不支持硬链接时退回复制
+            shutil.copyfile(source, tmp_path)
+
+    # 经临时文件替换，复制到一半中断也不会留下残缺的目标文件
+    _write_atomically(target, link)
 
 
 def build_tts(config: TTSConfig, client: Optional[OpenAI] = None) -> BaseTTS:
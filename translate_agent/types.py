@@ -1,9 +1,16 @@
+import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
+if TYPE_CHECKING:
+    import numpy as np
 
-@dataclass
+# dataclass(slots=True) 需要 Python 3.10+，更早版本退回普通 dataclass
+SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**SLOTS)
 class TranscriptSegment:
     """Single transcript segment with timing data."""
 
@@ -12,9 +19,11 @@ class TranscriptSegment:
     text: str
     translation: Optional[str] = None
     tts_path: Optional[Path] = None
+    tts_audio: Optional["np.ndarray"] = None  # 已解码的 mono int16 配音，存在时混音不再读取 tts_path
+    tts_sample_rate: Optional[int] = None
 
 
-@dataclass
+@dataclass(**SLOTS)
 class PipelineArtifacts:
     """Paths to the generated artifacts for a translation run."""
 
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import asyncio
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Coroutine, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+def run_async(coroutine: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine to completion from synchronous code."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        running = False
+    else:
+        running = True
+    if not running:
+        # 在 except 之外启动，协程中的异常不会串上 "no running event loop"
+        return asyncio.run(coroutine)
+    # Jupyter/Colab 中已有运行中的事件循环，改为在独立线程里启动新的事件循环
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
+
+
+@lru_cache(maxsize=None)
+def ffmpeg_executable() -> str:
+    """Path to ffmpeg: the system binary if on PATH, else the one bundled with imageio-ffmpeg (MoviePy)."""
+    path = shutil.which("ffmpeg")
+    if path:
+        return path
+    import imageio_ffmpeg
+
+    return imageio_ffmpeg.get_ffmpeg_exe()
+
+
+@lru_cache(maxsize=None)
+def ffprobe_executable() -> Optional[str]:
+    """Path to ffprobe if installed; imageio-ffmpeg does not bundle it."""
+    return shutil.which("ffprobe")
+
+
+def openai_http_client(max_connections: int):
+    """Pooled async HTTP client for AsyncOpenAI, with HTTP/2 when ``h2`` is installed.
+
+    Returns None (the SDK default client) when httpx is unavailable.
+    """
+    try:
+        import httpx
+        from openai import DefaultAsyncHttpxClient
+    except ImportError:
+        return None
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        http2 = False
+    else:
+        # HTTP/2 下并发请求复用同一条 TLS 连接多路传输
+        http2 = True
+    max_connections = max(1, max_connections)
+    return DefaultAsyncHttpxClient(
+        http2=http2,
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        timeout=httpx.Timeout(60.0, connect=10.0),
+    )
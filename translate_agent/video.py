@@ -1,16 +1,86 @@
 from __future__ import annotations
 
+import json
 import logging
+import os
+import re
+import subprocess
+from functools import lru_cache
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
-from moviepy.editor import AudioFileClip, CompositeAudioClip, VideoFileClip
+from .utils import ffmpeg_executable, ffprobe_executable
 
 logger = logging.getLogger(__name__)
 
+# 原声按比例降低音量后与配音直接相加（normalize=0 不做按路数衰减），时长以原视频为准；
+# duck 模式把配音复制一路作为侧链，配音出现时进一步压低原声
+MIX_FILTERS = {
+    "mix": "[0:a]volume={volume}[bg];[bg][1:a]amix=inputs=2:duration=first:normalize=0[aout]",
+    "duck": (
+        "[0:a]volume={volume}[bg];[1:a]asplit=2[dub][sc];"
+        "[bg][sc]sidechaincompress=threshold=0.05:ratio=8:attack=20:release=300[ducked];"
+        "[ducked][dub]amix=inputs=2:duration=first:normalize=0[aout]"
+    ),
+}
+
+
+# (路径, mtime, 大小) -> (时长, 是否有音轨)；一次探测同时得到两项，文件未变化时不再启动子进程
+_PROBE_CACHE: Dict[Tuple[str, float, int], Tuple[Optional[float], bool]] = {}
+
+_DURATION_PATTERN = re.compile(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)")
+_AUDIO_STREAM_PATTERN = re.compile(r"Stream #\S+.*: Audio:")
+
 
 def get_video_duration(video_path: Path) -> float:
-    with VideoFileClip(str(video_path)) as clip:
-        return float(clip.duration)
+    duration, _ = _probe(video_path)
+    if duration is None:
+        logger.warning("Could not probe the duration of %s; falling back to MoviePy", video_path)
+        from moviepy.editor import VideoFileClip
+
+        with VideoFileClip(str(video_path)) as clip:
+            duration = float(clip.duration)
+    return duration
+
+
+def has_audio_stream(video_path: Path) -> bool:
+    return _probe(video_path)[1]
+
+
+def _probe(video_path: Path) -> Tuple[Optional[float], bool]:
+    stat = video_path.stat()
+    key = (str(video_path.resolve()), stat.st_mtime, stat.st_size)
+    if key not in _PROBE_CACHE:
+        _PROBE_CACHE[key] = _probe_media(video_path)
+    return _PROBE_CACHE[key]
+
+
+def _probe_media(video_path: Path) -> Tuple[Optional[float], bool]:
+    """Read the container duration and whether any audio stream exists, without decoding."""
+    ffprobe = ffprobe_executable()
+    if ffprobe is not None:
+        result = subprocess.run(
+            [ffprobe, "-v", "error", "-show_entries", "format=duration:stream=codec_type", "-of", "json", str(video_path)],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode == 0:
+            info = json.loads(result.stdout or "{}")
+            duration = info.get("format", {}).get("duration")
+            has_audio = any(stream.get("codec_type") == "audio" for stream in info.get("streams", []))
+            try:
+                return (float(duration) if duration is not None else None), has_audio
+            except ValueError:
+                return None, has_audio
+        logger.warning("ffprobe could not read %s: %s", video_path, result.stderr.strip())
+    # 只有 imageio-ffmpeg 自带的 ffmpeg 时没有 ffprobe，从 ffmpeg -i 的输出中读取时长与流信息
+    result = subprocess.run([ffmpeg_executable(), "-hide_banner", "-i", str(video_path)], capture_output=True, text=True)
+    match = _DURATION_PATTERN.search(result.stderr)
+    duration = None
+    if match:
+        hours, minutes, seconds = match.groups()
+        duration = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+    return duration, _AUDIO_STREAM_PATTERN.search(result.stderr) is not None
 
 
 def mux_video_with_audio(
@@ -19,23 +89,53 @@ def mux_video_with_audio(
     output_path: Path,
     mix_original_audio: bool = True,
     original_volume: float = 0.25,
+    mix_mode: str = "mix",
 ) -> Path:
+    """Attach the dubbed track to the video, optionally over the original audio.
+
+    ``mix_mode`` is ``"mix"`` (constant-level original audio) or ``"duck"`` (the original
+    is compressed further whenever the dub is speaking).
+    """
+    if mix_mode not in MIX_FILTERS:
+        raise ValueError(f"Unsupported mix mode: {mix_mode}")
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with VideoFileClip(str(video_path)) as clip, AudioFileClip(str(dubbed_audio_path)) as dubbed_audio:
-        if mix_original_audio and clip.audio is not None:
-            original_audio = clip.audio.volumex(original_volume)
-            final_audio = CompositeAudioClip([original_audio, dubbed_audio])
-        else:
-            final_audio = dubbed_audio
-
-        clip_with_audio = clip.set_audio(final_audio)
-        logger.info("Writing final video to %s", output_path)
-        clip_with_audio.write_videofile(
-            str(output_path),
-            codec="libx264",
-            audio_codec="aac",
-            temp_audiofile="temp-audio.m4a",
-            remove_temp=True,
-            threads=4,
-        )
+    command = [ffmpeg_executable(), "-y", "-loglevel", "error", "-i", str(video_path), "-i", str(dubbed_audio_path)]
+    # 不混入原声时无需探测原视频
+    if mix_original_audio and has_audio_stream(video_path):
+        command += [
+            "-filter_complex",
+            MIX_FILTERS[mix_mode].format(volume=original_volume),
+            "-map", "0:v:0", "-map", "[aout]",
+        ]
+    else:
+        command += ["-map", "0:v:0", "-map", "1:a:0"]
+    output_args = ["-c:a", "aac", "-shortest", str(output_path)]
+    logger.info("Writing final video to %s", output_path)
+    # 视频流优先直接复制，不重新编码；只有音轨需要编码为 AAC。
+    # 原视频编码无法放入目标容器时才重新编码，依次尝试 NVENC 与 libx264
+    result = subprocess.run(command + ["-c:v", "copy"] + output_args, capture_output=True, text=True)
+    for encoder_args in ([] if result.returncode == 0 else _video_encoders()):
+        logger.warning("ffmpeg failed (%s); re-encoding video with %s", _last_line(result.stderr), encoder_args[1])
+        result = subprocess.run(command + encoder_args + output_args, capture_output=True, text=True)
+        if result.returncode == 0:
+            break
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed to mux {output_path}: {result.stderr.strip()}")
     return output_path
+
+
+def _last_line(text: str) -> str:
+    lines = text.strip().splitlines()
+    return lines[-1] if lines else ""
+
+
+@lru_cache(maxsize=None)
+def _video_encoders() -> Tuple[List[str], ...]:
+    """Video encoder arguments to try when the source stream cannot be copied."""
+    # 统一输出 yuv420p，4:4:4 或 10-bit 源重新编码后仍能被常见播放器和浏览器播放
+    software = ["-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p", "-threads", str(os.cpu_count() or 0)]
+    result = subprocess.run([ffmpeg_executable(), "-hide_banner", "-encoders"], capture_output=True, text=True)
+    # 编码器列表里有 NVENC 不代表本机有可用 GPU，失败时仍会回退到 libx264
+    if re.search(r"\bh264_nvenc\b", result.stdout):
+        return (["-c:v", "h264_nvenc", "-preset", "p4", "-tune", "ll", "-pix_fmt", "yuv420p"], software)
+    return (software,)